@@ -13,8 +13,11 @@ export interface SwapUI {
   from_amount: number;
   to_token: string;
   to_token_name: string;
-  to_amount: number;
-  exchange_rate: number;
+  to_amount: number | null;
+  exchange_rate: number | null;
+  rate_source?: string | null;
+  rate_age_seconds?: number | null;
+  rate_stale?: boolean;
   slippage: number;
   estimated_gas: number;
 }
@@ -5,9 +5,37 @@ Provides blockchain data access for AI agents
 
 import os
 import json
+import time
+import asyncio
 import httpx
 from typing import Dict, Any, Optional, List
 from urllib.parse import urljoin
+from services.http_client import http_pool
+
+
+MCP_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
+
+# Chains probed by address analytics, in order of preference
+ADDRESS_CHAINS = [
+    {"id": "11155111", "name": "Ethereum Sepolia"},
+    {"id": "1", "name": "Ethereum Mainnet"}
+]
+
+
+def _build_payload(method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the JSON-RPC payload for an MCP tool call"""
+    return {
+        "jsonrpc": "2.0",
+        "method": "tools/call",
+        "params": {
+            "name": method,
+            "arguments": params
+        },
+        "id": 1
+    }
 
 
 class BlockscoutAgent:
@@ -18,7 +46,7 @@ class BlockscoutAgent:
     def __init__(self):
         """Initialize the Blockscout MCP agent"""
         self.base_url = self.MCP_URL
-        self.client = httpx.Client(timeout=60.0)
+        self.client = http_pool.httpx_client()
     
     def _call_mcp(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -32,54 +60,53 @@ class BlockscoutAgent:
             Response from the MCP server
         """
         try:
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "tools/call",
-                "params": {
-                    "name": method,
-                    "arguments": params
-                },
-                "id": 1
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            }
-            
             response = self.client.post(
                 self.base_url, 
-                json=payload,
-                headers=headers,
+                json=_build_payload(method, params),
+                headers=MCP_HEADERS,
                 follow_redirects=True,
                 timeout=60.0
             )
             
-            if response.status_code != 200:
-                print(f"❌ HTTP Error: {response.status_code}")
-                return {}
-            
-            # Parse SSE stream
-            content_type = response.headers.get("content-type", "")
-            
-            if "text/event-stream" in content_type:
-                # Parse SSE response
-                return self._parse_sse_response(response.text)
-            else:
-                # Regular JSON response
-                result = response.json()
-                
-                if "error" in result:
-                    print(f"❌ MCP Error: {result['error']}")
-                    return {}
-                
-                return result.get("result", {})
+            return self._parse_response(response)
             
         except Exception as e:
             print(f"❌ Error calling MCP: {e}")
             return {}
     
-    def _parse_sse_response(self, text: str) -> Dict[str, Any]:
+    @classmethod
+    def _parse_response(cls, response: httpx.Response) -> Dict[str, Any]:
+        """
+        Parse an MCP HTTP response (SSE stream or plain JSON)
+        
+        Args:
+            response: HTTP response from the MCP server
+        
+        Returns:
+            JSON-RPC result, or {} on error
+        """
+        if response.status_code != 200:
+            print(f"❌ HTTP Error: {response.status_code}")
+            return {}
+        
+        # Parse SSE stream
+        content_type = response.headers.get("content-type", "")
+        
+        if "text/event-stream" in content_type:
+            # Parse SSE response
+            return cls._parse_sse_response(response.text)
+        
+        # Regular JSON response
+        result = response.json()
+        
+        if "error" in result:
+            print(f"❌ MCP Error: {result['error']}")
+            return {}
+        
+        return result.get("result", {})
+    
+    @staticmethod
+    def _parse_sse_response(text: str) -> Dict[str, Any]:
         """
         Parse Server-Sent Events (SSE) response
         
@@ -115,6 +142,45 @@ class BlockscoutAgent:
         
         return {}
     
+    @staticmethod
+    def _content_json(result: Dict[str, Any], default: Any) -> Any:
+        """Decode the JSON text of the first content item of an MCP result"""
+        if "content" in result and result["content"]:
+            return json.loads(result["content"][0]["text"])
+        return default
+    
+    @staticmethod
+    def _content_list(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Decode an MCP result that should contain a JSON list"""
+        content = BlockscoutAgent._content_json(result, [])
+        return content if isinstance(content, list) else []
+    
+    @staticmethod
+    def _content_transactions(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Decode a transactions result (direct list or nested data/items)"""
+        if "content" in result and result["content"]:
+            try:
+                content_text = result["content"][0]["text"]
+                content_data = json.loads(content_text)
+                
+                # Handle both direct array and nested data structure
+                if isinstance(content_data, list):
+                    return content_data
+                elif isinstance(content_data, dict) and "data" in content_data:
+                    # MCP returns data nested in a "data" field
+                    data = content_data["data"]
+                    if isinstance(data, list):
+                        return data
+                    elif isinstance(data, dict) and "items" in data:
+                        return data["items"]
+                
+                return []
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                print(f"❌ Error parsing transactions: {e}")
+                return []
+        
+        return []
+    
     def get_chains_list(self) -> List[Dict[str, Any]]:
         """Get list of all available chains"""
         result = self._call_mcp("get_chains_list", {})
@@ -142,12 +208,7 @@ class BlockscoutAgent:
         }
         
         result = self._call_mcp("get_address_info", params)
-        
-        if "content" in result and result["content"]:
-            content = json.loads(result["content"][0]["text"])
-            return content
-        
-        return {}
+        return self._content_json(result, {})
     
     def get_tokens_by_address(self, chain_id: str, address: str) -> List[Dict[str, Any]]:
         """
@@ -166,12 +227,7 @@ class BlockscoutAgent:
         }
         
         result = self._call_mcp("get_tokens_by_address", params)
-        
-        if "content" in result and result["content"]:
-            content = json.loads(result["content"][0]["text"])
-            return content if isinstance(content, list) else []
-        
-        return []
+        return self._content_list(result)
     
     def get_transactions_by_address(
         self, 
@@ -199,29 +255,7 @@ class BlockscoutAgent:
             params["limit"] = limit
         
         result = self._call_mcp("get_transactions_by_address", params)
-        
-        if "content" in result and result["content"]:
-            try:
-                content_text = result["content"][0]["text"]
-                content_data = json.loads(content_text)
-                
-                # Handle both direct array and nested data structure
-                if isinstance(content_data, list):
-                    return content_data
-                elif isinstance(content_data, dict) and "data" in content_data:
-                    # MCP returns data nested in a "data" field
-                    data = content_data["data"]
-                    if isinstance(data, list):
-                        return data
-                    elif isinstance(data, dict) and "items" in data:
-                        return data["items"]
-                
-                return []
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
-                print(f"❌ Error parsing transactions: {e}")
-                return []
-        
-        return []
+        return self._content_transactions(result)
     
     def get_token_transfers_by_address(
         self,
@@ -249,12 +283,7 @@ class BlockscoutAgent:
             params["limit"] = limit
         
         result = self._call_mcp("get_token_transfers_by_address", params)
-        
-        if "content" in result and result["content"]:
-            content = json.loads(result["content"][0]["text"])
-            return content if isinstance(content, list) else []
-        
-        return []
+        return self._content_list(result)
     
     def get_transaction_info(
         self,
@@ -469,10 +498,197 @@ class BlockscoutAgent:
             print(f"❌ Error calling REST API: {e}")
             return {}
     
-    def __del__(self):
-        """Cleanup on deletion"""
-        if hasattr(self, 'client'):
-            self.client.close()
+class AsyncBlockscoutAgent:
+    """Asyncio client for the Blockscout MCP server, for concurrent fan-out"""
+    
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, timeout: float = 60.0):
+        """
+        Args:
+            client: Shared AsyncClient (a private one is created if omitted)
+            timeout: Per-call timeout in seconds
+        """
+        self.base_url = BlockscoutAgent.MCP_URL
+        self.timeout = timeout
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=timeout)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the HTTP client if this agent created it"""
+        if self._owns_client:
+            await self.client.aclose()
+    
+    async def _call_mcp(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Async JSON-RPC call to the MCP server (see BlockscoutAgent._call_mcp)"""
+        try:
+            response = await self.client.post(
+                self.base_url,
+                json=_build_payload(method, params),
+                headers=MCP_HEADERS,
+                follow_redirects=True,
+                timeout=self.timeout
+            )
+            
+            return BlockscoutAgent._parse_response(response)
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Error calling MCP: {e}")
+            return {}
+    
+    async def get_address_info(self, chain_id: str, address: str) -> Dict[str, Any]:
+        """Get comprehensive information about an address"""
+        result = await self._call_mcp("get_address_info", {"chain_id": chain_id, "address": address})
+        return BlockscoutAgent._content_json(result, {})
+    
+    async def get_tokens_by_address(self, chain_id: str, address: str) -> List[Dict[str, Any]]:
+        """Get ERC20 token holdings for an address"""
+        result = await self._call_mcp("get_tokens_by_address", {"chain_id": chain_id, "address": address})
+        return BlockscoutAgent._content_list(result)
+    
+    async def get_transactions_by_address(
+        self,
+        chain_id: str,
+        address: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get transactions for an address"""
+        params = {"chain_id": chain_id, "address": address}
+        if limit:
+            params["limit"] = limit
+        
+        result = await self._call_mcp("get_transactions_by_address", params)
+        return BlockscoutAgent._content_transactions(result)
+    
+    async def get_token_transfers_by_address(
+        self,
+        chain_id: str,
+        address: str,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get ERC-20 token transfers for an address"""
+        params = {"chain_id": chain_id, "address": address}
+        if limit:
+            params["limit"] = limit
+        
+        result = await self._call_mcp("get_token_transfers_by_address", params)
+        return BlockscoutAgent._content_list(result)
+
+
+def _has_balance(address_info: Dict[str, Any]) -> bool:
+    """Whether a get_address_info result shows a non-zero native balance"""
+    if address_info and 'data' in address_info and 'basic_info' in address_info['data']:
+        balance = address_info['data']['basic_info'].get('coin_balance', 0)
+        try:
+            return bool(balance) and int(balance) > 0
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def fetch_address_analytics(
+    address: str,
+    deadline: float = 20.0,
+    limit: int = 20,
+    chains: Optional[List[Dict[str, str]]] = None,
+    client: Optional[httpx.AsyncClient] = None
+) -> Dict[str, Any]:
+    """
+    Fetch address info, tokens, transactions and token transfers concurrently
+    
+    Every chain is probed and queried at the same time; the first chain (in
+    order) where the address has a balance wins and the other chains' calls
+    are cancelled. Calls still running at the deadline are cancelled and their
+    results left empty, so latency is bounded by the slowest call or deadline.
+    
+    Args:
+        address: Ethereum address
+        deadline: Seconds allowed for the whole fan-out
+        limit: Maximum transactions / transfers to fetch
+        chains: Chains to probe, in order of preference (default: Sepolia, Mainnet)
+        client: Shared AsyncClient to use
+    
+    Returns:
+        Dict with chain_id, chain_name, address_info, tokens, transactions,
+        token_transfers, timed_out (names of calls cut off) and elapsed seconds
+    """
+    chains = chains or ADDRESS_CHAINS
+    started = time.monotonic()
+    
+    async with AsyncBlockscoutAgent(client=client, timeout=deadline) as agent:
+        tasks = {}
+        for chain in chains:
+            chain_id = chain["id"]
+            tasks[chain_id] = {
+                "address_info": asyncio.ensure_future(agent.get_address_info(chain_id, address)),
+                "tokens": asyncio.ensure_future(agent.get_tokens_by_address(chain_id, address)),
+                "transactions": asyncio.ensure_future(agent.get_transactions_by_address(chain_id, address, limit=limit)),
+                "token_transfers": asyncio.ensure_future(agent.get_token_transfers_by_address(chain_id, address, limit=limit)),
+            }
+        
+        all_tasks = [task for chain_tasks in tasks.values() for task in chain_tasks.values()]
+        
+        try:
+            # Wait for the balance probes first to decide which chain to keep
+            probes = [tasks[chain["id"]]["address_info"] for chain in chains]
+            await asyncio.wait(probes, timeout=deadline)
+            
+            selected = chains[0]
+            for chain in chains:
+                probe = tasks[chain["id"]]["address_info"]
+                if probe.done() and not probe.cancelled() and _has_balance(probe.result()):
+                    selected = chain
+                    break
+            
+            # Drop the speculative calls for the other chains
+            for chain_id, chain_tasks in tasks.items():
+                if chain_id != selected["id"]:
+                    for task in chain_tasks.values():
+                        task.cancel()
+            
+            selected_tasks = tasks[selected["id"]]
+            remaining = max(deadline - (time.monotonic() - started), 0)
+            await asyncio.wait(list(selected_tasks.values()), timeout=remaining)
+            
+            results = {
+                "chain_id": selected["id"],
+                "chain_name": selected["name"],
+                "timed_out": [],
+            }
+            defaults = {"address_info": {}, "tokens": [], "transactions": [], "token_transfers": []}
+            for name, task in selected_tasks.items():
+                if task.done() and not task.cancelled():
+                    results[name] = task.result()
+                else:
+                    task.cancel()
+                    results[name] = defaults[name]
+                    results["timed_out"].append(name)
+            
+            results["elapsed"] = round(time.monotonic() - started, 3)
+            return results
+        finally:
+            for task in all_tasks:
+                task.cancel()
+            await asyncio.gather(*all_tasks, return_exceptions=True)
+
+
+def get_address_analytics(address: str, deadline: float = 20.0, limit: int = 20) -> Dict[str, Any]:
+    """Blocking wrapper that runs fetch_address_analytics on the shared I/O loop"""
+    async def _run():
+        return await fetch_address_analytics(
+            address,
+            deadline=deadline,
+            limit=limit,
+            client=http_pool.async_client()
+        )
+    
+    return http_pool.run_async(_run(), timeout=deadline + 5)
 
 
 # Test the agent
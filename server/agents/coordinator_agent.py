@@ -52,7 +52,7 @@ def classify_intent_with_ai(query: str) -> Dict[str, Any]:
     """Classify user intent using ASI1 Mini LLM"""
     try:
         from tools.defi_tools import ASI1API
-        from openai import OpenAI
+        from services.llm_client import llm_registry
 
         asi_key = os.getenv("ASI_API_KEY")
 
@@ -62,11 +62,8 @@ def classify_intent_with_ai(query: str) -> Dict[str, Any]:
 
         print(f"🤖 Classifying intent with AI: '{query[:50]}...'")
 
-        # Create OpenAI client pointing to ASI1 endpoint
-        client = OpenAI(
-            api_key=asi_key,
-            base_url="https://api.asi1.ai/v1"
-        )
+        # Shared ASI1 client
+        client = llm_registry.get_client(asi_key)
 
         # Construct classification prompt
         prompt = f"""Analyze this user query and classify the intent.
@@ -81,7 +78,9 @@ Respond with ONLY ONE WORD: either "DEFI" or "GENERAL"
 """
 
         # Call ASI1 Mini
-        completion = client.chat.completions.create(
+        completion = llm_registry.chat_completion(
+            "intent_classification",
+            client,
             messages=[
                 {"role": "system", "content": "You are an intent classification expert. Respond with only one word: DEFI or GENERAL."},
                 {"role": "user", "content": prompt}
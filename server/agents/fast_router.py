@@ -0,0 +1,138 @@
+"""
+Fast-Path Router - Dispatches unambiguous chat messages without the tool-selection LLM
+Sends, swaps, transaction hashes and bare addresses are recognised with the
+deterministic parsers; anything else (or anything with extra requests around
+the command) falls back to the LLM.
+"""
+import os
+import re
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from agents.send_agent import SendParser
+from agents.swap_agent import SwapParser
+
+
+TX_HASH_PATTERN = re.compile(r'\b0x[a-fA-F0-9]{64}\b')
+ADDRESS_PATTERN = re.compile(r'\b0x[a-fA-F0-9]{40}\b')
+SEND_ADDRESS_PATTERN = re.compile(r'\bto\s+(0x[a-fA-F0-9]{40})\b', re.IGNORECASE)
+
+# Words that may surround a command without changing what it asks for
+FILLER_WORDS = {
+    "please", "pls", "can", "could", "would", "you", "i", "want", "to", "like",
+    "hey", "hi", "now", "me", "my", "for", "the", "a", "an", "of", "this", "is",
+    "what", "whats", "and", "just", "quickly", "superio", "thanks",
+}
+
+# Extra words allowed around a lone transaction hash / address
+TX_WORDS = {"lookup", "look", "up", "check", "tx", "txn", "transaction", "hash", "explain", "show", "details", "info", "about", "on", "happened", "in"}
+ADDRESS_WORDS = {"analyze", "analyse", "address", "wallet", "check", "show", "info", "about", "stats", "analytics", "look", "up", "lookup", "on", "profile", "overview"}
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+class FastPathRouter:
+    """Deterministic pre-router in front of the tool-selection LLM call"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics = {"messages": 0, "hits": 0, "fallbacks": 0}
+        self._tools: Dict[str, int] = {}
+
+    def route(self, message: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Pick a tool for a message when the intent is unambiguous
+
+        Returns:
+            (function_name, function_args) in the same format as an LLM tool call,
+            or None to let the LLM decide
+        """
+        if not self.enabled:
+            return None
+
+        routed = None
+        try:
+            routed = self._match(message)
+        except Exception as e:
+            print(f"⚠️ Fast-path routing failed: {e}")
+
+        with self._lock:
+            self._metrics["messages"] += 1
+            if routed:
+                self._metrics["hits"] += 1
+                self._tools[routed[0]] = self._tools.get(routed[0], 0) + 1
+            else:
+                self._metrics["fallbacks"] += 1
+        return routed
+
+    def _match(self, message: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        text = message.strip()
+        lower = text.lower()
+
+        # Send: "send 0.01 eth to 0x..." (EVM addresses only; the parser lowercases)
+        if SendParser.detect_send_intent(lower):
+            send_data = SendParser.parse_send_request(text)
+            address = SEND_ADDRESS_PATTERN.search(text)
+            if send_data and address and address.group(1).lower() == send_data["to_address"]:
+                command = re.search(r'(?:send|transfer|pay)\s+\S+\s+\S+\s+to\s+0x[a-f0-9]{40}', lower)
+                if command and self._only_words(lower, command.span(), FILLER_WORDS):
+                    return "send_token", {
+                        "token": send_data["token"],
+                        "amount": send_data["amount"],
+                        "to_address": address.group(1),
+                    }
+            return None
+
+        # Swap: "swap 5 sol for usdc" (the target token must be named)
+        if SwapParser.detect_swap_intent(lower):
+            swap_args = SwapParser.extract_swap_args(lower, require_target=True)
+            if swap_args and self._only_words(lower, swap_args["span"], FILLER_WORDS):
+                return "swap_token", {
+                    "from_token": swap_args["from_token"],
+                    "to_token": swap_args["to_token"],
+                    "from_amount": swap_args["from_amount"],
+                }
+            return None
+
+        # A single transaction hash
+        tx_hashes = TX_HASH_PATTERN.findall(text)
+        if len(tx_hashes) == 1:
+            match = TX_HASH_PATTERN.search(text)
+            if self._only_words(lower, match.span(), FILLER_WORDS | TX_WORDS):
+                return "lookup_transaction", {"transaction_hash": tx_hashes[0]}
+            return None
+
+        # A single address
+        addresses = ADDRESS_PATTERN.findall(text)
+        if len(addresses) == 1:
+            match = ADDRESS_PATTERN.search(text)
+            if self._only_words(lower, match.span(), FILLER_WORDS | ADDRESS_WORDS):
+                return "analyze_address", {"address": addresses[0]}
+
+        return None
+
+    @staticmethod
+    def _only_words(lower: str, span: Tuple[int, int], allowed: set) -> bool:
+        """True if everything outside span is punctuation or allowed words"""
+        rest = lower[:span[0]] + " " + lower[span[1]:]
+        if re.search(r'\d', rest):
+            return False
+        return all(word.replace("'", "") in allowed for word in WORD_PATTERN.findall(rest))
+
+    def stats(self) -> Dict[str, Any]:
+        """Fast-path hit rate and per-tool counts"""
+        with self._lock:
+            messages = self._metrics["messages"]
+            return {
+                **self._metrics,
+                "enabled": self.enabled,
+                "hit_rate": round(self._metrics["hits"] / messages, 3) if messages else None,
+                "tools": dict(self._tools),
+            }
+
+
+# Global instance
+fast_router = FastPathRouter(
+    enabled=os.getenv("FAST_PATH_ROUTER", "true").lower() not in ("0", "false", "no"),
+)
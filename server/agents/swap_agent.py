@@ -39,95 +39,47 @@ class SwapParser:
         "chainlink": {"symbol": "LINK", "name": "Chainlink", "decimals": 18},  # Full name alias
     }
 
-    # Mock exchange rates (fallback if API fails)
-    FALLBACK_RATES = {
-        "sol_usdc": 140.50,
-        "usdc_sol": 1/140.50,
-        "sol_eth": 0.045,
-        "eth_sol": 1/0.045,
-        "usdc_usdt": 1.0,
-        "usdt_usdc": 1.0,
-        "eth_usdc": 3800.0,
-        "usdc_eth": 1/3800.0,
-        "eth_fet": 1000.0,  # 1 ETH = 1000 FET
-        "fet_eth": 1/1000.0,
-        "fet_usdc": 3.8,  # FET price ~$3.80 (3800/1000)
-        "usdc_fet": 1/3.8,
-        "base_usdc": 1.0,  # BASE is ETH on Base network
-        "usdc_base": 1.0,
-        "eth_base": 1.0,
-        "base_eth": 1.0,
-        "btc_usdc": 45000.0,
-        "usdc_btc": 1/45000.0,
-    }
-
     @staticmethod
-    def get_exchange_rate(from_token: str, to_token: str, amount: float) -> float:
+    def get_quote(from_token: str, to_token: str, amount: float) -> Dict[str, Any]:
         """
-        Get real-time exchange rate from CoinGecko API
-        Falls back to mock rates if API unavailable
+        Quote a swap from the in-memory price oracle (no network call once prices are loaded)
+
+        Args:
+            from_token: Symbol to sell (e.g. "SOL")
+            to_token: Symbol to buy (e.g. "USDC")
+            amount: Amount of from_token
+
+        Returns:
+            exchange_rate, to_amount, rate_source, rate_age_seconds and rate_stale;
+            rate and amount are None when either token has no known price
         """
-        try:
-            import requests
-            
-            # Map our token symbols to CoinGecko IDs
-            coin_ids = {
-                "SOL": "solana",
-                "USDC": "usd-coin",
-                "USDT": "tether",
-                "ETH": "ethereum",
-                "BTC": "bitcoin",
-                "BASE": "ethereum",  # BASE uses ETH
-                "MATIC": "matic-network",
-                "AVAX": "avalanche-2",
-                "LINK": "chainlink",
-                "DAI": "dai",
-                "BONK": "bonk",
-                "WIF": "dogwifhat",
-                "JUP": "jupiter-exchange-solana",
+        from services.price_oracle import price_oracle
+
+        quote = price_oracle.quote(from_token, to_token, amount)
+        if quote is None:
+            print(f"⚠️ No price available for {from_token}/{to_token}")
+            return {
+                "exchange_rate": None,
+                "to_amount": None,
+                "rate_source": None,
+                "rate_age_seconds": None,
+                "rate_stale": True,
             }
-            
-            from_id = coin_ids.get(from_token.upper())
-            to_id = coin_ids.get(to_token.upper())
-            
-            if not from_id or not to_id:
-                raise ValueError("Token not supported")
-            
-            # Fetch prices from CoinGecko
-            response = requests.get(
-                f"https://api.coingecko.com/api/v3/simple/price",
-                params={
-                    "ids": f"{from_id},{to_id}",
-                    "vs_currencies": "usd"
-                },
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                from_price = data.get(from_id, {}).get("usd", 0)
-                to_price = data.get(to_id, {}).get("usd", 0)
-                
-                if from_price > 0 and to_price > 0:
-                    # Calculate exchange rate
-                    rate = from_price / to_price
-                    print(f"📊 Real-time rate from CoinGecko: 1 {from_token} = {rate:.6f} {to_token}")
-                    return rate
-            
-            raise ValueError("API returned no data")
-            
-        except Exception as e:
-            print(f"⚠️ Failed to fetch real-time rate: {e}")
-            # Fallback to mock rates
-            rate_key = f"{from_token.lower()}_{to_token.lower()}"
-            fallback_rate = SwapParser.FALLBACK_RATES.get(rate_key)
-            
-            if fallback_rate:
-                print(f"🔄 Using fallback rate: 1 {from_token} = {fallback_rate:.6f} {to_token}")
-                return fallback_rate
-            
-            print(f"⚠️ No rate found, using 1:1")
-            return 1.0
+
+        if quote["stale"]:
+            print(f"⚠️ Stale rate for {from_token}/{to_token} ({quote['age_seconds']:.0f}s old)")
+        return {
+            "exchange_rate": quote["rate"],
+            "to_amount": round(quote["to_amount"], 6),
+            "rate_source": quote["source"],
+            "rate_age_seconds": quote["age_seconds"],
+            "rate_stale": quote["stale"],
+        }
+
+    @staticmethod
+    def get_exchange_rate(from_token: str, to_token: str, amount: float) -> Optional[float]:
+        """Exchange rate from the price oracle (None if either token has no price)"""
+        return SwapParser.get_quote(from_token, to_token, amount)["exchange_rate"]
 
     @staticmethod
     def detect_swap_intent(message: str) -> bool:
@@ -137,10 +89,18 @@ class SwapParser:
         return any(keyword in message_lower for keyword in swap_keywords)
 
     @staticmethod
-    def parse_swap_request(message: str) -> Optional[Dict[str, Any]]:
+    def extract_swap_args(message: str, require_target: bool = False) -> Optional[Dict[str, Any]]:
         """
-        Parse swap request from message
-        Example: "swap 5 sol for usdc" -> {from_token: "SOL", from_amount: 5, to_token: "USDC"}
+        Extract swap arguments from a message without fetching a rate
+        Example: "swap 5 sol for usdc" -> {from_token: "sol", to_token: "usdc", from_amount: 5.0, span: (0, 19)}
+
+        Args:
+            message: User message
+            require_target: Only accept messages that name the token to swap into
+                            (no guessed USDC/SOL default)
+
+        Returns:
+            swap_token arguments plus the matched character span, or None
         """
         message_lower = message.lower()
 
@@ -152,6 +112,8 @@ class SwapParser:
             r'(?:swap|exchange|trade|convert)\s+(\d+\.?\d*)\s+(\w+)\s+(?:for|to|into)',
             r'(?:buy|sell)\s+(\d+\.?\d*)\s+(\w+)',
         ]
+        if require_target:
+            patterns = patterns[:1]
 
         for pattern in patterns:
             match = re.search(pattern, message_lower)
@@ -179,31 +141,57 @@ class SwapParser:
                 except ValueError:
                     continue
 
-                # Get exchange rate from API (real-time or fallback)
-                from_token_symbol = SwapParser.TOKENS[from_token]["symbol"]
-                to_token_symbol = SwapParser.TOKENS[to_token]["symbol"]
-                
-                rate = SwapParser.get_exchange_rate(from_token_symbol, to_token_symbol, from_amount)
-                to_amount = from_amount * rate
-
                 return {
-                    "from_token": SwapParser.TOKENS[from_token]["symbol"],
-                    "from_token_name": SwapParser.TOKENS[from_token]["name"],
+                    "from_token": from_token,
+                    "to_token": to_token,
                     "from_amount": from_amount,
-                    "to_token": SwapParser.TOKENS[to_token]["symbol"],
-                    "to_token_name": SwapParser.TOKENS[to_token]["name"],
-                    "to_amount": round(to_amount, 6),
-                    "exchange_rate": rate,
-                    "type": "swap"
+                    "span": match.span(),
                 }
 
         return None
 
+    @staticmethod
+    def parse_swap_request(message: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse swap request from message
+        Example: "swap 5 sol for usdc" -> {from_token: "SOL", from_amount: 5, to_token: "USDC"}
+        """
+        args = SwapParser.extract_swap_args(message)
+        if not args:
+            return None
+
+        from_token = args["from_token"]
+        to_token = args["to_token"]
+        from_amount = args["from_amount"]
+
+        # Quote from the price oracle's in-memory prices
+        from_token_symbol = SwapParser.TOKENS[from_token]["symbol"]
+        to_token_symbol = SwapParser.TOKENS[to_token]["symbol"]
+
+        quote = SwapParser.get_quote(from_token_symbol, to_token_symbol, from_amount)
+
+        return {
+            "from_token": from_token_symbol,
+            "from_token_name": SwapParser.TOKENS[from_token]["name"],
+            "from_amount": from_amount,
+            "to_token": to_token_symbol,
+            "to_token_name": SwapParser.TOKENS[to_token]["name"],
+            **quote,
+            "type": "swap"
+        }
+
     @staticmethod
     def generate_swap_response(swap_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate swap UI response"""
+        response = f"I'll help you swap {swap_data['from_amount']} {swap_data['from_token']} for {swap_data['to_token']}."
+        if swap_data.get("exchange_rate") is None:
+            response += " I couldn't get a current price for this pair, so please check the rate before confirming."
+        elif swap_data.get("rate_stale"):
+            minutes = max(1, int(swap_data.get("rate_age_seconds") or 0) // 60)
+            response += f" Note: the quoted rate is about {minutes} min old and may have moved."
+
         return {
-            "response": f"I'll help you swap {swap_data['from_amount']} {swap_data['from_token']} for {swap_data['to_token']}.",
+            "response": response,
             "swap_ui": {
                 "from_token": swap_data["from_token"],
                 "from_token_name": swap_data["from_token_name"],
@@ -212,6 +200,9 @@ class SwapParser:
                 "to_token_name": swap_data["to_token_name"],
                 "to_amount": swap_data["to_amount"],
                 "exchange_rate": swap_data["exchange_rate"],
+                "rate_source": swap_data.get("rate_source"),
+                "rate_age_seconds": swap_data.get("rate_age_seconds"),
+                "rate_stale": swap_data.get("rate_stale", True),
                 "slippage": 0.5,  # 0.5% slippage tolerance
                 "estimated_gas": 0.00005,  # SOL
             }
@@ -0,0 +1,220 @@
+"""
+ASGI Entry Point - Serves the API under uvicorn without tying a worker to each chat
+/api/chat and /api/chat/stream are coroutines: the blocking chat turn runs on a
+bounded thread pool and the event loop only awaits it, so a slow Blockscout or
+Chart-IMG call holds a pool thread, never the server, and a waiting SSE stream
+costs a coroutine. Every other route is the Flask app, run on its own thread
+pool by a2wsgi's WSGIMiddleware.
+
+Run:
+    uvicorn api.asgi:application --host 0.0.0.0 --port $PORT
+"""
+import os
+import sys
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional
+
+from a2wsgi import WSGIMiddleware
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.server import app, _asi_key, _chat_turn, _sse_event
+from api.startup import warm_up
+
+
+# Largest request body accepted by the native chat routes
+MAX_BODY_BYTES = 1024 * 1024
+
+ERROR_RESPONSE = "Sorry, I encountered an error. Please try again."
+
+
+class ChatASGIApp:
+    """Native async chat routes in front of the Flask app"""
+
+    def __init__(self, flask_app, chat_workers: int = 200, wsgi_workers: int = 32, keepalive: float = 15.0):
+        """
+        Args:
+            flask_app: The Flask application serving all other routes
+            chat_workers: Chat turns running at once (threads mostly waiting on LLM/HTTP I/O)
+            wsgi_workers: Threads for requests handled by the Flask app
+            keepalive: Seconds between SSE keep-alive comments
+        """
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=wsgi_workers)
+        self.chat_workers = chat_workers
+        self.wsgi_workers = wsgi_workers
+        self.keepalive = keepalive
+        self._chat_executor: Optional[ThreadPoolExecutor] = None
+        self.routes = {
+            ("POST", "/api/chat"): self.chat,
+            ("POST", "/api/chat/stream"): self.chat_stream,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["type"] == "http":
+            handler = self.routes.get((scope["method"], scope["path"]))
+            if handler is not None:
+                await handler(scope, receive, send)
+                return
+
+        # Everything else (including CORS preflight) is served by Flask
+        await self.wsgi(scope, receive, send)
+
+    # ---------- routes ----------
+
+    async def chat(self, scope, receive, send):
+        """POST /api/chat - same contract as the Flask view"""
+        data = await self._read_json(receive)
+        if not data or "message" not in data:
+            await self._send_json(scope, send, 400, {"error": "Missing 'message' field"})
+            return
+
+        asi_key = _asi_key()
+        if not asi_key:
+            await self._send_json(scope, send, 500, {"error": "ASI API key not configured"})
+            return
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._executor(), _chat_turn, data["message"], data.get("user_id", "anonymous"), asi_key
+            )
+        except Exception as e:
+            print(f"❌ Error in chat: {e}")
+            await self._send_json(scope, send, 500, {"error": str(e), "response": ERROR_RESPONSE})
+            return
+
+        await self._send_json(scope, send, 200, result)
+
+    async def chat_stream(self, scope, receive, send):
+        """POST /api/chat/stream - Server-Sent Events, same events as the Flask view"""
+        data = await self._read_json(receive)
+        if not data or "message" not in data:
+            await self._send_json(scope, send, 400, {"error": "Missing 'message' field"})
+            return
+
+        asi_key = _asi_key()
+        if not asi_key:
+            await self._send_json(scope, send, 500, {"error": "ASI API key not configured"})
+            return
+
+        message = data["message"]
+        user_id = data.get("user_id", "anonymous")
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def emit(event, payload):
+            loop.call_soon_threadsafe(events.put_nowait, (event, payload))
+
+        def run_chat():
+            try:
+                _chat_turn(message, user_id, asi_key, emit=emit)
+            except Exception as e:
+                print(f"❌ Error in chat stream: {e}")
+                emit("error", {"error": str(e), "response": ERROR_RESPONSE})
+
+        loop.run_in_executor(self._executor(), run_chat)
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ] + self._cors_headers(scope),
+        })
+        # Flush headers immediately
+        await send({"type": "http.response.body", "body": b": stream open\n\n", "more_body": True})
+
+        while True:
+            try:
+                event, payload = await asyncio.wait_for(events.get(), self.keepalive)
+            except asyncio.TimeoutError:
+                await send({"type": "http.response.body", "body": b": keep-alive\n\n", "more_body": True})
+                continue
+
+            await send({"type": "http.response.body", "body": _sse_event(event, payload).encode(), "more_body": True})
+            if event in ("done", "error"):
+                break
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    # ---------- helpers ----------
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._chat_executor is None:
+            self._chat_executor = ThreadPoolExecutor(max_workers=self.chat_workers, thread_name_prefix="chat")
+        return self._chat_executor
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._executor()
+                warm_up()
+                print(f"✅ ASGI app ready ({self.chat_workers} chat workers, {self.wsgi_workers} WSGI threads)")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._chat_executor is not None:
+                    self._chat_executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_json(receive) -> Optional[Dict[str, Any]]:
+        """Request body as JSON (None if empty, too large or invalid)"""
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            body.extend(message.get("body", b""))
+            if len(body) > MAX_BODY_BYTES:
+                return None
+            if not message.get("more_body"):
+                break
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    async def _send_json(self, scope, send, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body, default=str).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ] + self._cors_headers(scope),
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    def _cors_headers(self, scope) -> List[Tuple[bytes, bytes]]:
+        """CORS headers flask-cors would add for this request (single source of CORS config)"""
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        with self.flask_app.test_request_context(scope["path"], method=scope["method"], headers=headers):
+            response = self.flask_app.process_response(self.flask_app.response_class())
+        return [
+            (key.lower().encode("latin-1"), value.encode("latin-1"))
+            for key, value in response.headers.items()
+            if key.lower().startswith("access-control-")
+        ]
+
+
+# Global instance
+application = ChatASGIApp(
+    app,
+    chat_workers=int(os.getenv("ASGI_CHAT_WORKERS", 200)),
+    wsgi_workers=int(os.getenv("ASGI_WSGI_WORKERS", 32)),
+    keepalive=float(os.getenv("SSE_KEEPALIVE", 15)),
+)
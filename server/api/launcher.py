@@ -0,0 +1,212 @@
+"""
+Production Launcher - Runs the API under gunicorn with autotuned workers and threads
+Worker processes are sized from the CPUs and memory actually available to the
+container (cgroup limits included), the app is imported once in the master
+before forking (preload), and workers are recycled and time-limited.
+
+Usage:
+    python -m api.launcher                  # ASGI (uvicorn workers, api/asgi.py)
+    python -m api.launcher --mode wsgi      # Flask app on gthread workers
+    python -m api.launcher --print-config   # Show the tuned settings and exit
+
+Graceful reload: `kill -HUP <master pid>` starts new workers and lets the old ones
+finish their requests (with preload the code itself is only re-read on restart).
+"""
+import os
+import sys
+import math
+import argparse
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+APP_URIS = {
+    "asgi": "api.asgi:application",
+    "wsgi": "api.server:app",
+}
+
+# Resident memory of one worker after preload, and of one extra busy thread (MB)
+WORKER_MEMORY_MB = float(os.getenv("WORKER_MEMORY_MB", 250))
+THREAD_MEMORY_MB = float(os.getenv("THREAD_MEMORY_MB", 2))
+
+# Share of the memory limit workers may use (the rest is headroom for spikes)
+MEMORY_BUDGET = 0.8
+
+# Threads per worker: chat turns for ASGI, connections for gthread. A worker is
+# only added if it can still run TARGET_THREADS threads
+MAX_THREADS = {"asgi": 200, "wsgi": 64}
+TARGET_THREADS = {"asgi": 64, "wsgi": 16}
+MIN_THREADS = 8
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus() -> float:
+    """CPUs usable by this process (affinity and cgroup CPU quota)"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    quota = _read("/sys/fs/cgroup/cpu.max")
+    if quota:
+        parts = quota.split()
+        if len(parts) == 2 and parts[0] != "max":
+            cpus = min(cpus, int(parts[0]) / int(parts[1]))
+    else:
+        # cgroup v1
+        quota_us = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period_us = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota_us and period_us and int(quota_us) > 0:
+            cpus = min(cpus, int(quota_us) / int(period_us))
+
+    return max(cpus, 1.0)
+
+
+def available_memory_mb() -> float:
+    """Memory limit for this process in MB (cgroup limit or physical memory)"""
+    limits = []
+    try:
+        limits.append(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (ValueError, OSError, AttributeError):
+        pass
+
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read(path)
+        if value and value.isdigit():
+            limits.append(int(value))
+
+    # Unlimited cgroups report "max" or a huge number; physical memory still applies
+    return min(limits) / (1024 * 1024) if limits else 512.0
+
+
+def autotune(mode: str = "asgi", cpus: Optional[float] = None, memory_mb: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Worker and thread counts for the available CPUs and memory
+
+    Workers: one per CPU, as many as fit in the memory budget with
+    TARGET_THREADS threads each (at least one).
+    Threads: the memory left per worker divided among threads, capped per mode.
+    WEB_CONCURRENCY and WEB_THREADS override the computed values.
+
+    Returns:
+        {workers, threads, cpus, memory_mb}
+    """
+    cpus = cpus if cpus is not None else available_cpus()
+    memory_mb = memory_mb if memory_mb is not None else available_memory_mb()
+    budget = memory_mb * MEMORY_BUDGET
+
+    per_worker = WORKER_MEMORY_MB + TARGET_THREADS[mode] * THREAD_MEMORY_MB
+    workers = max(1, min(math.ceil(cpus), int(budget // per_worker)))
+    headroom = budget / workers - WORKER_MEMORY_MB
+    threads = int(min(MAX_THREADS[mode], max(MIN_THREADS, headroom // THREAD_MEMORY_MB)))
+
+    return {
+        "workers": int(os.getenv("WEB_CONCURRENCY") or workers),
+        "threads": int(os.getenv("WEB_THREADS") or threads),
+        "cpus": round(cpus, 2),
+        "memory_mb": int(memory_mb),
+    }
+
+
+def uvicorn_worker_class() -> str:
+    """uvicorn's gunicorn worker (moved to the uvicorn-worker package in newer releases)"""
+    try:
+        import uvicorn_worker  # noqa: F401
+        return "uvicorn_worker.UvicornWorker"
+    except ImportError:
+        return "uvicorn.workers.UvicornWorker"
+
+
+def _warm_up_worker(worker):
+    """gunicorn post_worker_init hook: warm the handlers before the worker takes requests"""
+    from api.startup import warm_up
+    warm_up()
+
+
+def gunicorn_options(mode: str = "asgi", port: Optional[int] = None) -> Dict[str, Any]:
+    """Complete gunicorn settings for a mode"""
+    tuned = autotune(mode)
+    port = port or int(os.getenv("PORT") or os.getenv("FLASK_PORT", 5001))
+
+    options = {
+        "bind": f"0.0.0.0:{port}",
+        "workers": tuned["workers"],
+        "preload_app": os.getenv("GUNICORN_PRELOAD", "true").lower() not in ("0", "false", "no"),
+        # Workers silent for this long are killed and replaced
+        "timeout": int(os.getenv("GUNICORN_TIMEOUT", 120)),
+        # Time in-flight requests get to finish on reload / shutdown
+        "graceful_timeout": int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30)),
+        "keepalive": int(os.getenv("GUNICORN_KEEPALIVE", 75)),
+        # Recycle workers periodically (jitter avoids restarting all at once)
+        "max_requests": int(os.getenv("GUNICORN_MAX_REQUESTS", 2000)),
+        "max_requests_jitter": int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 200)),
+        "forwarded_allow_ips": "*",
+        "errorlog": "-",
+        "accesslog": "-" if os.getenv("GUNICORN_ACCESS_LOG", "false").lower() == "true" else None,
+    }
+
+    if mode == "asgi":
+        options["worker_class"] = uvicorn_worker_class()
+        # Chat turns in flight per worker (read by api/asgi.py at import)
+        os.environ.setdefault("ASGI_CHAT_WORKERS", str(tuned["threads"]))
+    else:
+        options["worker_class"] = "gthread"
+        options["threads"] = tuned["threads"]
+        # The ASGI app warms up in its lifespan startup; gthread workers do it here
+        options["post_worker_init"] = _warm_up_worker
+
+    return {"app_uri": APP_URIS[mode], "tuning": tuned, "options": options}
+
+
+def run(mode: str = "asgi", port: Optional[int] = None):
+    """Start gunicorn in the foreground"""
+    from gunicorn.app.base import BaseApplication
+    from gunicorn.util import import_app
+
+    config = gunicorn_options(mode, port)
+    options = config["options"]
+
+    class LauncherApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                if value is not None and key in self.cfg.settings:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return import_app(config["app_uri"])
+
+    threads = os.environ.get("ASGI_CHAT_WORKERS") if mode == "asgi" else options.get("threads")
+    print(f"🚀 Starting {config['app_uri']} on {options['bind']}: "
+          f"{options['workers']} workers x {threads} threads "
+          f"({config['tuning']['cpus']} CPUs, {config['tuning']['memory_mb']} MB)")
+    sys.stdout.flush()
+
+    LauncherApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Superio API under gunicorn")
+    parser.add_argument("--mode", choices=sorted(APP_URIS), default=os.getenv("SERVER_MODE", "asgi"))
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--print-config", action="store_true", help="Print the tuned settings and exit")
+    args = parser.parse_args()
+
+    if args.print_config:
+        import json
+        print(json.dumps(gunicorn_options(args.mode, args.port), indent=2, default=str))
+        return
+
+    run(args.mode, args.port)
+
+
+if __name__ == "__main__":
+    main()
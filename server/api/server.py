@@ -4,9 +4,11 @@ Bridges HTTP requests to uAgents communication
 """
 import os
 import sys
+import json
+import queue
 import asyncio
 import threading
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -17,6 +19,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 env_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
 load_dotenv(env_path)
 
+# Chat hot path, imported once at startup (see api/startup.py for the rest)
+from services.llm_client import llm_registry
+from services.context_cache import context_cache
+from services.persistence_queue import persistence_queue
+from api.chat_handler_new import handle_chat_request
+
 app = Flask(__name__)
 
 # CORS Configuration - Allow Vercel and local development
@@ -146,6 +154,37 @@ def asi_health_check():
         }), 500
 
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Cache and performance metrics"""
+    from services.pool_cache import pool_cache
+    from services.http_client import http_pool
+    from services.knowledge_cache import knowledge_cache
+    from services.live_knowledge import live_graphs
+    from agents.fast_router import fast_router
+    from services.response_cache import response_cache
+    from services.analysis_cache import yield_analysis_cache
+    from services.market_cache import market_cache
+    from services.price_oracle import price_oracle
+    from services.lazy_import import lazy_import_stats
+
+    return jsonify({
+        "yield_pool_cache": pool_cache.stats(),
+        "http": http_pool.stats(),
+        "llm": llm_registry.stats(),
+        "persistence": persistence_queue.stats(),
+        "context_cache": context_cache.stats(),
+        "knowledge_cache": knowledge_cache.stats(),
+        "live_graphs": live_graphs.stats(),
+        "fast_router": fast_router.stats(),
+        "response_cache": response_cache.stats(),
+        "yield_analysis_cache": yield_analysis_cache.stats(),
+        "market_cache": market_cache.stats(),
+        "price_oracle": price_oracle.stats(),
+        "lazy_modules": lazy_import_stats()
+    }), 200
+
+
 @app.route('/api/agents', methods=['GET'])
 def list_agents():
     """List available agents"""
@@ -179,6 +218,99 @@ def list_agents():
     return jsonify({"agents": agents}), 200
 
 
+def _persists_history(user_id) -> bool:
+    """Anonymous and demo users have no stored chat history"""
+    return bool(user_id) and user_id not in ('anonymous', 'web_user')
+
+
+def _prepare_chat(message: str, user_id: str) -> str:
+    """
+    Load recent conversation context and store the incoming user message
+    Returns the context string for the chat handler ("" if none)
+    """
+    if not _persists_history(user_id):
+        return ""
+
+    # Get recent chat history for context (cached per wallet)
+    context = ""
+    try:
+        context = context_cache.get_context(user_id)
+        if context:
+            print(f"📝 Loaded conversation context ({len(context)} chars)")
+    except Exception as e:
+        print(f"⚠️ Failed to load context: {e}")
+
+    # Save user message in the background
+    persistence_queue.enqueue_message(user_id, 'user', message)
+    context_cache.add_message(user_id, 'user', message)
+
+    return context
+
+
+def _persist_chat_result(user_id: str, result: dict, client):
+    """
+    Queue the assistant response and a summary refresh
+    Both are written by the persistence queue after the response is sent
+    """
+    if not _persists_history(user_id):
+        return
+
+    context_cache.add_message(user_id, 'assistant', result.get('response', ''))
+    persistence_queue.enqueue_message(
+        user_id,
+        'assistant',
+        result.get('response', ''),
+        metadata={
+            'swap_ui': result.get('swap_ui'),
+            'send_ui': result.get('send_ui'),
+            'tools_used': result.get('tools_used'),
+            'yield_pools': result.get('yield_pools'),
+            'metta_knowledge': result.get('metta_knowledge'),
+        }
+    )
+
+    # Auto-update summary if needed
+    persistence_queue.enqueue_summary(user_id, client)
+
+
+def _asi_key():
+    """Configured ASI API key, or None if missing / still the placeholder"""
+    asi_key = os.getenv("ASI_API_KEY")
+    if not asi_key or asi_key == "your_asi_api_key_here":
+        return None
+    return asi_key
+
+
+def _chat_turn(message: str, user_id: str, asi_key: str, emit=None) -> dict:
+    """
+    One blocking chat turn: load context, run the chat handler, queue persistence
+    Shared by the Flask views and the ASGI entry point (api/asgi.py)
+
+    Args:
+        emit: Optional callback(event, data) for streaming; receives 'done'
+              with the result before it is persisted
+    """
+    # Load context and store the user message
+    context = _prepare_chat(message, user_id)
+
+    # Shared ASI1 client (connections are reused across requests)
+    client = llm_registry.get_client(asi_key)
+
+    # Use the AI-driven chat handler with context
+    result = handle_chat_request(message, user_id, client, asi_key, context, emit=emit)
+    if emit is not None:
+        emit("done", result)
+
+    # Save assistant response to database
+    _persist_chat_result(user_id, result, client)
+    return result
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """
@@ -198,94 +330,15 @@ def chat():
         print(f"Message: {message}")
         print(f"User ID: {user_id}")
 
-        # Import database and services
-        from db.chat_history_db import db
-        from services.summarizer import ChatSummarizer
-
-        # Get recent chat history for context
-        context = ""
-        if user_id and user_id != 'anonymous' and user_id != 'web_user':
-            try:
-                recent_messages = db.get_recent_messages(user_id, limit=5)
-                if recent_messages:
-                    context = ChatSummarizer.create_context_string(recent_messages)
-                    print(f"📝 Loaded {len(recent_messages)} messages for context")
-            except Exception as e:
-                print(f"⚠️ Failed to load context: {e}")
-
-        # Save user message to database
-        if user_id and user_id != 'anonymous' and user_id != 'web_user':
-            try:
-                db.add_message(
-                    wallet_address=user_id,
-                    role='user',
-                    content=message
-                )
-                print(f"✅ Saved user message to database")
-            except Exception as e:
-                print(f"⚠️ Failed to save user message: {e}")
-
-        # Import tools
-        from tools.defi_tools import CoinGeckoAPI, FearGreedIndexAPI, extract_recommendation, ASI1API
-        from tools.yield_tools import DeFiLlamaYields, YieldAnalyzer, YIELD_TOOLS
-        from tools.action_tools import ACTION_TOOLS
-        from agents.swap_agent import SwapParser
-        from agents.send_agent import SendParser
-        from openai import OpenAI
-        import json
-
         # Get ASI API key
-        asi_key = os.getenv("ASI_API_KEY")
-        print(f"ASI API Key present: {bool(asi_key and asi_key != 'your_asi_api_key_here')}")
+        asi_key = _asi_key()
+        print(f"ASI API Key present: {bool(asi_key)}")
 
-        if not asi_key or asi_key == "your_asi_api_key_here":
+        if not asi_key:
             return jsonify({"error": "ASI API key not configured"}), 500
 
-        # Initialize OpenAI client
-        client = OpenAI(
-            api_key=asi_key,
-            base_url="https://api.asi1.ai/v1"
-        )
-
-        # Use the AI-driven chat handler with context
-        from api.chat_handler_new import handle_chat_request
+        result = _chat_turn(message, user_id, asi_key)
 
-        result = handle_chat_request(message, user_id, client, asi_key, context)
-        
-        # Save assistant response to database
-        if user_id and user_id != 'anonymous' and user_id != 'web_user':
-            try:
-                db.add_message(
-                    wallet_address=user_id,
-                    role='assistant',
-                    content=result.get('response', ''),
-                    metadata={
-                        'swap_ui': result.get('swap_ui'),
-                        'send_ui': result.get('send_ui'),
-                        'tools_used': result.get('tools_used'),
-                        'yield_pools': result.get('yield_pools'),
-                        'metta_knowledge': result.get('metta_knowledge'),
-                    }
-                )
-                print(f"✅ Saved assistant response to database")
-                
-                # Auto-update summary if needed
-                try:
-                    chat = db.get_chat_history(user_id)
-                    if chat and chat.get('messages'):
-                        message_count = len(chat['messages'])
-                        ChatSummarizer.update_summary_if_needed(
-                            user_id, 
-                            message_count, 
-                            db, 
-                            client
-                        )
-                except Exception as e:
-                    print(f"⚠️ Failed to update summary: {e}")
-                    
-            except Exception as e:
-                print(f"⚠️ Failed to save assistant response: {e}")
-        
         return jsonify(result), 200
 
     except Exception as e:
@@ -295,6 +348,68 @@ def chat():
         return jsonify({"error": str(e), "response": "Sorry, I encountered an error. Please try again."}), 500
 
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Streaming chat endpoint (Server-Sent Events)
+    Same request body as /api/chat. Emits:
+        tool_selected - tool name and arguments chosen by the AI
+        tool_data     - tool results as soon as they are ready (pools, swap_ui, address metrics, ...)
+        token         - LLM text chunks
+        done          - the complete /api/chat response body
+        error         - if the request failed
+    """
+    data = request.get_json(silent=True)
+    if not data or 'message' not in data:
+        return jsonify({"error": "Missing 'message' field"}), 400
+
+    message = data['message']
+    user_id = data.get('user_id', 'anonymous')
+
+    asi_key = _asi_key()
+    if not asi_key:
+        return jsonify({"error": "ASI API key not configured"}), 500
+
+    events = queue.Queue()
+
+    def emit(event, payload):
+        events.put((event, payload))
+
+    def run_chat():
+        try:
+            _chat_turn(message, user_id, asi_key, emit=emit)
+        except Exception as e:
+            print(f"❌ Error in chat stream: {e}")
+            events.put(("error", {"error": str(e), "response": "Sorry, I encountered an error. Please try again."}))
+
+    threading.Thread(target=run_chat, name="chat-stream", daemon=True).start()
+
+    keepalive = float(os.getenv("SSE_KEEPALIVE", 15))
+
+    def generate():
+        # Flush headers immediately
+        yield ": stream open\n\n"
+        while True:
+            try:
+                event, payload = events.get(timeout=keepalive)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield _sse_event(event, payload)
+            if event in ("done", "error"):
+                break
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
 @app.route('/api/defi/analyze', methods=['POST'])
 def analyze_defi():
     """
@@ -452,36 +567,48 @@ def get_protocol(protocol):
 
 @app.route('/api/yield/metta', methods=['GET'])
 def get_metta_knowledge():
-    """Get MeTTa knowledge graph from yield pools"""
+    """
+    Get MeTTa knowledge graph from yield pools
+    Built once per distinct pool set and served with an ETag
+    (If-None-Match with the current ETag returns 304)
+    Query params:
+        limit: number of safe pools in the graph (default 20, max 500)
+    """
     try:
-        from tools.yield_tools import DeFiLlamaYields, YieldAnalyzer
-        import os
+        from flask import Response
+        from services.pool_cache import pool_cache
+        from services.knowledge_cache import knowledge_cache
+
+        limit = max(1, min(request.args.get('limit', default=20, type=int), 500))
         
         # Get API keys
         defillama_key = os.getenv("DEFILLAMA_API_KEY")
         
-        # Fetch all pools
-        pools = DeFiLlamaYields.get_all_pools(api_key=defillama_key)
+        # Get all pools from the shared snapshot cache
+        snapshot = pool_cache.get_snapshot(api_key=defillama_key)
         
-        if not pools:
+        if not snapshot or not snapshot.pools:
             return jsonify({"error": "Failed to fetch yield pools"}), 500
         
         # Filter for safe pools (APY 7-15%, TVL > $1M)
-        safe_pools = [
-            p for p in pools 
-            if 7 <= (p.get('apy', 0) or 0) + (p.get('apyReward', 0) or 0) <= 15
-            and p.get('tvlUsd', 0) >= 1000000
-        ][:20]  # Take top 20
-        
-        print(f"✅ Found {len(safe_pools)} safe pools for MeTTa knowledge graph")
+        safe_pools = snapshot.index.search(
+            min_apy=7,
+            max_apy=15,
+            min_tvl=1000000,
+            limit=limit
+        )
         
-        # Create MeTTa knowledge base
-        metta_kb = YieldAnalyzer.create_metta_knowledge_base(safe_pools)
+        # Get (or build) the MeTTa knowledge base for this pool set
+        entry = knowledge_cache.get_knowledge(safe_pools, memo_key=(snapshot.version, "metta", limit))
         
-        if not metta_kb or not metta_kb.get('graph_data'):
+        if not entry or not entry["knowledge"].get('graph_data'):
             return jsonify({"error": "Failed to create MeTTa knowledge base"}), 500
-        
-        return jsonify(metta_kb), 200
+
+        headers = {"ETag": f'"{entry["etag"]}"', "Cache-Control": "no-cache"}
+        if entry["etag"] in request.if_none_match:
+            return Response(status=304, headers=headers)
+
+        return Response(entry["body"], status=200, mimetype='application/json', headers=headers)
         
     except Exception as e:
         print(f"❌ Error in get_metta_knowledge: {e}")
@@ -490,26 +617,81 @@ def get_metta_knowledge():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/yield/metta/delta', methods=['GET'])
+def get_metta_knowledge_delta():
+    """
+    Poll the MeTTa knowledge graph for changes across pool refreshes
+    Query params:
+        limit: number of safe pools in the graph (default 20, max 500)
+        since: graph version the client holds (omit for the full graph)
+    Returns {"version", "full": true, "graph_data"} when the client has no version
+    or is too far behind, else {"version", "full": false, "delta"}
+    """
+    try:
+        from services.pool_cache import pool_cache
+        from services.live_knowledge import live_graphs
+
+        limit = max(1, min(request.args.get('limit', default=20, type=int), 500))
+        since = request.args.get('since', type=int)
+
+        snapshot = pool_cache.get_snapshot(api_key=os.getenv("DEFILLAMA_API_KEY"))
+        if not snapshot or not snapshot.pools:
+            return jsonify({"error": "Failed to fetch yield pools"}), 500
+
+        graph = live_graphs.get(("metta", limit))
+        if graph.source_version != snapshot.version:
+            # Same selection as /api/yield/metta
+            safe_pools = snapshot.index.search(
+                min_apy=7,
+                max_apy=15,
+                min_tvl=1000000,
+                limit=limit
+            )
+            graph.sync(safe_pools, snapshot.version)
+
+        delta = graph.delta_since(since) if since is not None else None
+        if delta is None:
+            return jsonify({"full": True, **graph.graph()})
+
+        return jsonify({"version": delta["version"], "full": False, "delta": delta})
+
+    except Exception as e:
+        print(f"❌ Error in get_metta_knowledge_delta: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
 # ============= Chat History Endpoints =============
 
 @app.route('/api/chat/history', methods=['GET'])
 def get_chat_history():
-    """Get chat history for a wallet address"""
+    """
+    Get chat history for a wallet address, one page at a time
+    Query params:
+        limit: messages per page (default CHAT_HISTORY_PAGE_SIZE, max 200)
+        before: cursor from a previous page's next_before (omit for the latest page)
+    """
     try:
         wallet_address = request.args.get('wallet_address')
         
         if not wallet_address:
             return jsonify({"error": "wallet_address parameter required"}), 400
-        
+
+        limit = request.args.get('limit', default=int(os.getenv("CHAT_HISTORY_PAGE_SIZE", 50)), type=int)
+        limit = max(1, min(limit, 200))
+        before = request.args.get('before', type=int)
+
         from db.chat_history_db import db
         
-        history = db.get_chat_history(wallet_address)
+        history = db.get_history_page(wallet_address, limit=limit, before=before)
         
         if not history:
             return jsonify({
                 "wallet_address": wallet_address,
                 "summary": "New conversation",
-                "messages": []
+                "messages": [],
+                "next_before": None
             }), 200
         
         return jsonify(history), 200
@@ -537,6 +719,7 @@ def add_chat_message():
         success = db.add_message(wallet_address, role, content, metadata)
         
         if success:
+            context_cache.add_message(wallet_address, role, content)
             return jsonify({"success": True}), 200
         else:
             return jsonify({"error": "Failed to add message"}), 500
@@ -617,13 +800,18 @@ if __name__ == '__main__':
     print(f"  - GET  /api/health")
     print(f"  - GET  /api/asi-health (Test ASI API)")
     print(f"  - POST /api/chat")
+    print(f"  - POST /api/chat/stream (Server-Sent Events)")
     print(f"  - GET  /api/agents")
-    print(f"  - GET  /api/chat/history?wallet_address=<address>")
+    print(f"  - GET  /api/metrics (Cache metrics)")
+    print(f"  - GET  /api/chat/history?wallet_address=<address>&limit=<n>&before=<cursor>")
     print(f"  - POST /api/chat/message (Add message)")
     print(f"  - PUT  /api/chat/summary (Update summary)")
     print(f"\nLogs will be printed to console...")
     sys.stdout.flush()
 
+    from api.startup import warm_up
+    warm_up()
+
     app.run(
         host='0.0.0.0',
         port=port,
@@ -0,0 +1,131 @@
+"""
+Startup Warm-Up - Imports, validates and warms the chat handlers once per process
+Runs before a worker accepts requests (ASGI lifespan, gunicorn post_worker_init,
+or `python api/server.py`) so the first chat after boot doesn't pay for module
+imports, client construction or the first yield pool download.
+"""
+import os
+import time
+import threading
+import importlib
+from typing import Dict, Any, List
+
+# Everything a chat request can touch (api.server already imports the hot path)
+WARM_MODULES = [
+    "openai",
+    "api.chat_handler_new",
+    "services.summarizer",
+    "services.price_oracle",
+    "services.market_cache",
+    "services.live_knowledge",
+    "db.chat_history_db",
+    "tools.defi_tools",
+    "tools.yield_tools",
+    "tools.action_tools",
+    "tools.chart_tools",
+    "tools.pool_index",
+    "knowledge.defi_knowledge",
+    "agents.fast_router",
+    "agents.swap_agent",
+    "agents.send_agent",
+    "agents.trading_agent",
+    "agents.blockscout_agent",
+]
+
+_lock = threading.Lock()
+_warmed_pid = None
+_report: Dict[str, Any] = {}
+
+
+def warm_up(prefetch: bool = True) -> Dict[str, Any]:
+    """
+    Import, validate and warm the chat handlers (once per process)
+
+    Args:
+        prefetch: Also start loading the yield pool snapshot and swap prices in the background
+
+    Returns:
+        {imports_ms: {module: ms}, errors: [...], elapsed_ms}
+    """
+    global _warmed_pid, _report
+
+    with _lock:
+        if _warmed_pid == os.getpid():
+            return _report
+
+        started = time.perf_counter()
+        imports_ms: Dict[str, float] = {}
+        errors: List[str] = []
+
+        for name in WARM_MODULES:
+            module_started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                errors.append(f"import {name}: {e}")
+            imports_ms[name] = round((time.perf_counter() - module_started) * 1000, 1)
+
+        errors.extend(_validate_tools())
+        errors.extend(_warm_clients())
+        if prefetch:
+            _start_prefetch()
+
+        _report = {
+            "imports_ms": imports_ms,
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        _warmed_pid = os.getpid()
+
+    slowest = sorted(imports_ms.items(), key=lambda item: item[1], reverse=True)[:3]
+    print(f"🔥 Warm-up done in {_report['elapsed_ms']:.0f}ms "
+          f"(slowest: {', '.join(f'{name} {ms:.0f}ms' for name, ms in slowest)})")
+    for error in errors:
+        print(f"❌ Warm-up: {error}")
+    return _report
+
+
+def _validate_tools() -> List[str]:
+    """Every tool offered to the LLM must have a handler in TOOL_HANDLERS (what _execute_tool dispatches on)"""
+    try:
+        from api.chat_handler_new import TOOL_HANDLERS
+        from tools.yield_tools import YIELD_TOOLS
+        from tools.action_tools import ACTION_TOOLS
+    except Exception as e:
+        return [f"tool validation: {e}"]
+
+    errors = []
+    for tool in ACTION_TOOLS + YIELD_TOOLS:
+        function = tool.get("function", {})
+        name = function.get("name")
+        if not callable(TOOL_HANDLERS.get(name)):
+            errors.append(f"tool '{name}' has no handler")
+        if "parameters" not in function:
+            errors.append(f"tool '{name}' has no parameters schema")
+    return errors
+
+
+def _warm_clients() -> List[str]:
+    """Build the shared HTTP and LLM clients (no requests are sent)"""
+    try:
+        from services.http_client import http_pool
+        from services.llm_client import llm_registry
+
+        http_pool.httpx_client()
+        if os.getenv("ASI_API_KEY"):
+            llm_registry.get_client()
+        return []
+    except Exception as e:
+        return [f"clients: {e}"]
+
+
+def _start_prefetch():
+    """Download the yield pool snapshot and start the price oracle off the request path"""
+    if os.getenv("WARM_UP_PREFETCH", "true").lower() in ("0", "false", "no"):
+        return
+
+    from services.pool_cache import pool_cache
+    from services.price_oracle import price_oracle
+
+    price_oracle.start()
+    threading.Thread(target=pool_cache.get_snapshot, name="pool-cache-prefetch", daemon=True).start()
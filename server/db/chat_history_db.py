@@ -1,138 +1,383 @@
 """
 MongoDB database service for chat history
+
+Storage layout:
+    chat_history   one header document per wallet
+                   {wallet_address, summary, message_count, created_at, updated_at, metadata}
+    chat_messages  fixed-size message buckets per wallet
+                   {wallet_address, bucket, count, messages: [...]}
+                   message number `seq` lives in bucket seq // BUCKET_SIZE
+
+Chats created before bucketing keep their messages in a `messages` array on the
+header until scripts/migrate_chat_buckets.py moves them into buckets.
 """
 import os
-from pymongo import MongoClient
+import threading
+from pymongo import MongoClient, ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from models.chat_history import ChatHistory, ChatMessage
 
 
+# Messages per bucket document
+BUCKET_SIZE = int(os.getenv("CHAT_BUCKET_SIZE", 50))
+
+
 class ChatHistoryDB:
     """Database service for managing chat history"""
-    
+
     def __init__(self):
-        """Initialize MongoDB connection"""
-        mongodb_uri = os.getenv('MONGODBURI')
-        
-        if not mongodb_uri:
+        """Read the MongoDB settings (the connection is opened on first use)"""
+        self.mongodb_uri = os.getenv('MONGODBURI')
+        self._client = None
+        self._db = None
+        self._collection = None
+        self._messages = None
+        self._connected = False
+        self._connecting = False
+        self._lock = threading.RLock()
+
+        if not self.mongodb_uri:
             print("⚠️ Warning: MONGODBURI not set. Chat history will not be saved.")
-            self.client = None
-            self.db = None
+
+    def _connect(self):
+        """Connect and ensure indexes once, on first access (after any fork)"""
+        if self._connected:
             return
-        
+
+        with self._lock:
+            # _connecting: ensure_indexes() below re-enters through the properties
+            if self._connected or self._connecting:
+                return
+            if not self.mongodb_uri:
+                self._connected = True
+                return
+            self._connecting = True
+
+            try:
+                self._client = MongoClient(self.mongodb_uri)
+                self._db = self._client.get_database()
+                self._collection = self._db.chat_history
+                self._messages = self._db.chat_messages
+                print("✅ Connected to MongoDB")
+                self.ensure_indexes()
+            except Exception as e:
+                print(f"❌ Error connecting to MongoDB: {e}")
+                self._client = None
+                self._db = None
+                self._collection = None
+                self._messages = None
+            finally:
+                self._connecting = False
+                self._connected = True
+
+    @property
+    def client(self):
+        self._connect()
+        return self._client
+
+    @property
+    def db(self):
+        self._connect()
+        return self._db
+
+    @property
+    def collection(self):
+        self._connect()
+        return self._collection
+
+    @property
+    def messages(self):
+        self._connect()
+        return self._messages
+
+    def ensure_indexes(self) -> bool:
+        """
+        Create the indexes chat storage relies on (idempotent)
+            chat_history:  unique wallet_address - makes header upserts race-free
+            chat_messages: unique (wallet_address, bucket) - bucket range reads
+        """
+        if self.collection is None:
+            return False
+
         try:
-            self.client = MongoClient(mongodb_uri)
-            self.db = self.client.get_database()
-            self.collection = self.db.chat_history
-            print("✅ Connected to MongoDB")
+            self.collection.create_index([("wallet_address", ASCENDING)], unique=True)
+            self.messages.create_index(
+                [("wallet_address", ASCENDING), ("bucket", ASCENDING)],
+                unique=True
+            )
+            return True
         except Exception as e:
-            print(f"❌ Error connecting to MongoDB: {e}")
-            self.client = None
-            self.db = None
-    
+            # e.g. duplicate wallet headers left over from the old check-then-insert
+            print(f"⚠️ Could not create chat history indexes: {e}")
+            return False
+
     def create_chat(self, wallet_address: str, summary: str = "New conversation", initial_message: Optional[Dict] = None) -> Optional[str]:
-        """Create a new chat for a wallet address"""
-        if not self.collection:
+        """Create a new chat for a wallet address (returns the existing one if present)"""
+        if self.collection is None:
             print("⚠️ MongoDB not available")
             return None
-        
+
         try:
-            # Check if chat already exists
-            existing = self.collection.find_one({"wallet_address": wallet_address})
-            if existing:
-                return str(existing["_id"])
-            
-            # Create new chat
-            chat = {
-                "wallet_address": wallet_address,
-                "summary": summary,
-                "messages": [],
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-                "metadata": {}
-            }
-            
+            now = datetime.utcnow()
+            result = self.collection.update_one(
+                {"wallet_address": wallet_address},
+                {
+                    "$setOnInsert": {
+                        "summary": summary,
+                        "message_count": 0,
+                        "created_at": now,
+                        "updated_at": now,
+                        "metadata": {}
+                    }
+                },
+                upsert=True
+            )
+
+            if result.upserted_id is None:
+                existing = self.collection.find_one({"wallet_address": wallet_address}, {"_id": 1})
+                return str(existing["_id"]) if existing else None
+
             # Add initial message if provided
             if initial_message:
-                chat["messages"].append({
-                    "role": initial_message.get("role", "user"),
-                    "content": initial_message.get("content", ""),
-                    "timestamp": datetime.utcnow(),
-                    "metadata": initial_message.get("metadata")
-                })
-            
-            result = self.collection.insert_one(chat)
-            return str(result.inserted_id)
+                self.add_messages(wallet_address, [
+                    self.new_message(
+                        initial_message.get("role", "user"),
+                        initial_message.get("content", ""),
+                        initial_message.get("metadata")
+                    )
+                ])
+
+            return str(result.upserted_id)
         except Exception as e:
             print(f"❌ Error creating chat: {e}")
             return None
-    
+
     def add_message(self, wallet_address: str, role: str, content: str, metadata: Optional[Dict] = None) -> bool:
         """Add a message to the chat"""
-        if not self.collection:
+        if self.collection is None:
             print("⚠️ MongoDB not available - messages will not be saved")
             print("⚠️ Please check that MONGODBURI is set in your .env file")
             return False
 
         try:
-            message = {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow(),
-                "metadata": metadata or {}
-            }
-
             print(f"💾 Saving {role} message for wallet: {wallet_address[:10]}...")
 
-            # Create chat if it doesn't exist
-            existing_chat = self.collection.find_one({"wallet_address": wallet_address})
-            if not existing_chat:
-                print(f"📝 Creating new chat for wallet: {wallet_address[:10]}...")
-                self.create_chat(wallet_address)
-
-            result = self.collection.update_one(
-                {"wallet_address": wallet_address},
-                {
-                    "$push": {"messages": message},
-                    "$set": {"updated_at": datetime.utcnow()}
-                }
-            )
-
-            if result.modified_count > 0:
+            if self.add_messages(wallet_address, [self.new_message(role, content, metadata)]):
                 print(f"✅ Successfully saved {role} message")
                 return True
             else:
-                print(f"⚠️ Message was not saved (modified_count: {result.modified_count})")
+                print(f"⚠️ Message was not saved")
                 return False
         except Exception as e:
             print(f"❌ Error adding message: {e}")
             import traceback
             traceback.print_exc()
             return False
-    
+
+    @staticmethod
+    def new_message(role: str, content: str, metadata: Optional[Dict] = None) -> Dict:
+        """Build a message document (timestamped now, when the message happened)"""
+        return {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.utcnow(),
+            "metadata": metadata or {}
+        }
+
+    def reserve_sequence(self, wallet_address: str, count: int) -> int:
+        """
+        Reserve `count` consecutive message numbers on the chat header
+        (creating the chat if needed)
+
+        Returns:
+            First reserved sequence number
+
+        Raises database errors so the caller can retry
+        """
+        now = datetime.utcnow()
+        header = self.collection.find_one_and_update(
+            {"wallet_address": wallet_address},
+            {
+                "$inc": {"message_count": count},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {
+                    "summary": "New conversation",
+                    "created_at": now,
+                    "metadata": {}
+                }
+            },
+            projection={"message_count": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return header["message_count"] - count
+
+    def add_messages(self, wallet_address: str, messages: List[Dict], first_seq: Optional[int] = None) -> bool:
+        """
+        Append several messages to a chat
+        Reserves sequence numbers on the header, then pushes the messages into
+        their buckets. Pushes are idempotent: a bucket that already holds the
+        batch's messages is left alone, so a failed write can be retried with
+        the same first_seq without gaps or duplicates.
+
+        Args:
+            wallet_address: Wallet address
+            messages: Message documents in order (see new_message)
+            first_seq: Sequence number reserved by an earlier attempt (see reserve_sequence)
+
+        Raises database errors so the caller can retry
+        """
+        if self.collection is None:
+            print("⚠️ MongoDB not available - messages will not be saved")
+            return False
+        if not messages:
+            return True
+
+        if first_seq is None:
+            first_seq = self.reserve_sequence(wallet_address, len(messages))
+
+        # Group by bucket; a batch can straddle a bucket boundary
+        buckets: Dict[int, List[Dict]] = {}
+        for offset, message in enumerate(messages):
+            seq = first_seq + offset
+            buckets.setdefault(seq // BUCKET_SIZE, []).append({**message, "seq": seq})
+
+        now = datetime.utcnow()
+        for bucket, bucket_messages in buckets.items():
+            try:
+                # Each bucket's messages are pushed atomically, so checking the first seq is enough
+                self.messages.update_one(
+                    {
+                        "wallet_address": wallet_address,
+                        "bucket": bucket,
+                        "messages.seq": {"$ne": bucket_messages[0]["seq"]}
+                    },
+                    {
+                        "$push": {"messages": {"$each": bucket_messages}},
+                        "$inc": {"count": len(bucket_messages)},
+                        "$set": {"updated_at": now},
+                        "$setOnInsert": {"created_at": now}
+                    },
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                # The bucket exists and already holds these messages (unique wallet/bucket index)
+                pass
+        return True
+
+    def get_message_count(self, wallet_address: str) -> int:
+        """Number of messages in a chat, read from the header without loading messages"""
+        if self.collection is None:
+            return 0
+
+        try:
+            result = list(self.collection.aggregate([
+                {"$match": {"wallet_address": wallet_address}},
+                {"$project": {"count": {"$add": [
+                    {"$ifNull": ["$message_count", 0]},
+                    {"$size": {"$ifNull": ["$messages", []]}}
+                ]}}},
+                {"$limit": 1}
+            ]))
+            return result[0]["count"] if result else 0
+        except Exception as e:
+            print(f"❌ Error counting messages: {e}")
+            return 0
+
     def get_chat_history(self, wallet_address: str) -> Optional[Dict]:
-        """Get full chat history for a wallet"""
-        if not self.collection:
+        """Get full chat history for a wallet (header with all messages assembled)"""
+        if self.collection is None:
             return None
-        
+
         try:
             chat = self.collection.find_one({"wallet_address": wallet_address})
             if not chat:
                 return None
-            
+
+            # Legacy (un-migrated) messages come first, then the buckets
+            messages = chat.get("messages") or []
+            buckets = self.messages.find(
+                {"wallet_address": wallet_address},
+                {"messages": 1, "_id": 0}
+            ).sort("bucket", ASCENDING)
+            messages += self._ordered_messages(buckets)
+
+            chat["messages"] = messages
+            chat["message_count"] = len(messages)
+
             # Convert ObjectId to string
             chat["_id"] = str(chat["_id"])
             return chat
         except Exception as e:
             print(f"❌ Error getting chat history: {e}")
             return None
-    
+
+    def get_history_page(self, wallet_address: str, limit: int = 50, before: Optional[int] = None) -> Optional[Dict]:
+        """
+        Get one page of chat history, newest first page by default
+
+        Args:
+            wallet_address: Wallet address
+            limit: Maximum number of messages
+            before: Return messages with seq below this cursor (None = latest)
+
+        Returns:
+            Chat header with `messages` (oldest first) and `next_before`,
+            the cursor for the previous page (None when there is none)
+        """
+        if self.collection is None:
+            return None
+
+        try:
+            headers = list(self.collection.aggregate([
+                {"$match": {"wallet_address": wallet_address}},
+                {"$limit": 1},
+                {"$addFields": {"legacy_count": {"$size": {"$ifNull": ["$messages", []]}}}},
+                {"$project": {"messages": 0}}
+            ]))
+            if not headers:
+                return None
+            chat = headers[0]
+            legacy_count = chat.pop("legacy_count", 0)
+
+            if legacy_count:
+                # Not migrated yet - page over the assembled history by position
+                messages = self.get_chat_history(wallet_address)["messages"]
+                total = len(messages)
+                end = total if before is None else max(0, min(before, total))
+                start = max(0, end - limit)
+                page = [{**message, "seq": seq} for seq, message in enumerate(messages[start:end], start)]
+            else:
+                total = chat.get("message_count", 0)
+                end = total if before is None else max(0, min(before, total))
+                start = max(0, end - limit)
+                page = []
+                if end > start:
+                    buckets = self.messages.find(
+                        {
+                            "wallet_address": wallet_address,
+                            "bucket": {"$gte": start // BUCKET_SIZE, "$lte": (end - 1) // BUCKET_SIZE}
+                        },
+                        {"messages": 1, "_id": 0}
+                    )
+                    page = [m for m in self._ordered_messages(buckets) if start <= m.get("seq", 0) < end]
+
+            chat["_id"] = str(chat["_id"])
+            chat["message_count"] = total
+            chat["messages"] = page
+            chat["next_before"] = start if start > 0 else None
+            return chat
+        except Exception as e:
+            print(f"❌ Error getting chat history page: {e}")
+            return None
+
     def get_all_chats(self, wallet_address: str) -> List[Dict]:
         """Get all chats for a wallet (for future multi-chat support)"""
-        if not self.collection:
+        if self.collection is None:
             return []
-        
+
         try:
             chats = list(self.collection.find({"wallet_address": wallet_address}))
             for chat in chats:
@@ -141,12 +386,12 @@ class ChatHistoryDB:
         except Exception as e:
             print(f"❌ Error getting all chats: {e}")
             return []
-    
+
     def update_summary(self, wallet_address: str, summary: str) -> bool:
         """Update the chat summary"""
-        if not self.collection:
+        if self.collection is None:
             return False
-        
+
         try:
             result = self.collection.update_one(
                 {"wallet_address": wallet_address},
@@ -161,36 +406,60 @@ class ChatHistoryDB:
         except Exception as e:
             print(f"❌ Error updating summary: {e}")
             return False
-    
+
     def delete_chat(self, wallet_address: str) -> bool:
-        """Delete a chat"""
-        if not self.collection:
+        """Delete a chat and its message buckets"""
+        if self.collection is None:
             return False
-        
+
         try:
             result = self.collection.delete_one({"wallet_address": wallet_address})
+            self.messages.delete_many({"wallet_address": wallet_address})
             return result.deleted_count > 0
         except Exception as e:
             print(f"❌ Error deleting chat: {e}")
             return False
-    
+
     def get_recent_messages(self, wallet_address: str, limit: int = 10) -> List[Dict]:
-        """Get recent messages for context"""
-        if not self.collection:
+        """
+        Get recent messages for context
+        Reads only the newest buckets through the (wallet_address, bucket) index
+        """
+        if self.collection is None:
             return []
-        
+
         try:
-            chat = self.collection.find_one({"wallet_address": wallet_address})
-            if not chat or not chat.get("messages"):
-                return []
-            
+            # The newest bucket may be partly filled, so read one extra;
+            # $slice caps what each bucket sends back at the last `limit` messages
+            bucket_count = limit // BUCKET_SIZE + 2
+            buckets = self.messages.find(
+                {"wallet_address": wallet_address},
+                {"messages": {"$slice": -limit}, "_id": 0}
+            ).sort("bucket", DESCENDING).limit(bucket_count)
+            messages = self._ordered_messages(buckets)
+
+            if len(messages) < limit:
+                # Chat not migrated yet - take the rest from the legacy array
+                legacy = self.collection.find_one(
+                    {"wallet_address": wallet_address, "messages": {"$exists": True}},
+                    {"messages": {"$slice": -(limit - len(messages))}, "summary": 1, "_id": 0}
+                )
+                if legacy:
+                    messages = (legacy.get("messages") or []) + messages
+
             # Get last N messages
-            messages = chat.get("messages", [])
             return messages[-limit:] if len(messages) > limit else messages
         except Exception as e:
             print(f"❌ Error getting recent messages: {e}")
             return []
 
+    @staticmethod
+    def _ordered_messages(buckets) -> List[Dict]:
+        """Flatten bucket documents into messages ordered by sequence number"""
+        messages = [message for bucket in buckets for message in bucket.get("messages", [])]
+        messages.sort(key=lambda message: message.get("seq", 0))
+        return messages
+
 
 # Global instance
 db = ChatHistoryDB()
@@ -1,24 +1,264 @@
 """
 MeTTa Knowledge Base for DeFi Pools
 Represents pools, tokens, and relationships as a knowledge graph
+
+Facts are stored as (predicate, subject, object) triples with typed objects:
+numbers stay floats, quoted strings are Literal, anything else is an entity id.
+Per-predicate indexes answer queries without scanning; the MeTTa text form is
+rendered only when asked for (facts, to_metta_string). Graph nodes and edges
+are maintained as facts are added or removed, so get_graph_data is a single
+pass and update_pools can report exactly what changed in the graph.
+Rules are compiled once (knowledge/rules.py) and evaluated over all pools at once.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import re
 
+from knowledge.rules import PoolFrame, Rule, compile_rules
+
+
+# Type declarations '(: entity Type)' use this predicate
+TYPE_PREDICATE = ":"
+
+# Number formatting of numeric predicates in MeTTa output
+NUMBER_FORMATS = {
+    "hasAPY": ".2f",
+    "hasAPYBase": ".2f",
+    "hasAPYReward": ".2f",
+    "hasTVL": ".0f",
+}
+
+# Entity id prefixes that become graph nodes, and their node types
+NODE_TYPES = {"pool_": "pool", "token_": "token", "chain_": "chain"}
+
+# Relations drawn as graph edges
+EDGE_PREDICATES = ("isInPool", "onChain")
+
+Triple = Tuple[str, str, Any]
+
+SAFETY_RULES = [
+    """
+    (= (isSafePool $p)
+       (and
+         (> (hasAPY $p) 7.0)
+         (< (hasAPY $p) 15.0)
+         (> (hasTVL $p) 1000000.0)))
+    """,
+    """
+    (= (isHighRiskPool $p)
+       (or
+         (> (hasAPY $p) 50.0)
+         (< (hasTVL $p) 100000.0)))
+    """,
+    """
+    (= (hasStableCoins $p)
+       (or
+         (isInPool token_USDC $p)
+         (isInPool token_USDT $p)
+         (isInPool token_DAI $p)))
+    """,
+]
+
+# Compiled once; used by the query_* helpers even if add_safety_rules wasn't called
+DEFAULT_RULES = compile_rules("\n".join(SAFETY_RULES))
+
+
+class Literal(str):
+    """String value rendered in double quotes (as opposed to an entity id)"""
+
 
 class DeFiKnowledgeBase:
     """MeTTa-style knowledge representation for DeFi pools"""
     
     def __init__(self):
-        self.facts = []
         self.rules = []
         self.entities = set()
+
+        # Triples in insertion order (dict keys double as the de-duplication set)
+        self._triples: Dict[Triple, None] = {}
+
+        # predicate -> subject -> [objects] and predicate -> object -> [subjects]
+        self._subject_index: Dict[str, Dict[str, List[Any]]] = {}
+        self._object_index: Dict[str, Dict[Any, List[str]]] = {}
+
+        # entity id -> number of triples mentioning it (graph nodes live while > 0)
+        self._entity_refs: Dict[str, int] = {}
+
+        # Bumped by every update_pools call that changed something
+        self.version = 0
+
+        self._facts_cache: Optional[List[str]] = None
+
+        # Graph view, kept up to date by add_fact
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._edges: Dict[Triple, Dict[str, str]] = {}
+        self._graph_cache: Optional[Dict[str, Any]] = None
+
+        # Compiled rules by name, and the columnar pool view they run on
+        self._compiled_rules: Dict[str, Rule] = {}
+        self._frame: Optional[PoolFrame] = None
+
+    @property
+    def facts(self) -> List[str]:
+        """All facts as MeTTa statement strings (rendered on demand)"""
+        if self._facts_cache is None:
+            self._facts_cache = [self._render(triple) for triple in self._triples]
+        return self._facts_cache
+
+    def add_fact(self, predicate: str, subject: str, obj: Any) -> bool:
+        """
+        Add one (predicate, subject, object) triple
+        Returns False if the exact triple is already known
+        """
+        triple = (predicate, subject, obj)
+        if triple in self._triples:
+            return False
+
+        self._triples[triple] = None
+        self._subject_index.setdefault(predicate, {}).setdefault(subject, []).append(obj)
+        self._object_index.setdefault(predicate, {}).setdefault(obj, []).append(subject)
+        if predicate == TYPE_PREDICATE:
+            self.entities.add(subject)
+        for entity in self._mentioned_entities(triple):
+            self._entity_refs[entity] = self._entity_refs.get(entity, 0) + 1
+
+        self._add_to_graph(predicate, subject, obj)
+        self._invalidate()
+        return True
+
+    def remove_fact(self, predicate: str, subject: str, obj: Any) -> bool:
+        """
+        Remove one (predicate, subject, object) triple
+        Returns False if the triple isn't known
+        """
+        triple = (predicate, subject, obj)
+        if triple not in self._triples:
+            return False
+
+        del self._triples[triple]
+        self._unindex(self._subject_index, predicate, subject, obj)
+        self._unindex(self._object_index, predicate, obj, subject)
+        if predicate == TYPE_PREDICATE and not self.objects(TYPE_PREDICATE, subject):
+            self.entities.discard(subject)
+
+        self._remove_from_graph(predicate, subject, obj)
+        for entity in self._mentioned_entities(triple):
+            self._entity_refs[entity] -= 1
+            if self._entity_refs[entity] == 0:
+                del self._entity_refs[entity]
+                self._nodes.pop(entity, None)
+
+        self._invalidate()
+        return True
+
+    @staticmethod
+    def _unindex(index: Dict[str, Dict[Any, List[Any]]], predicate: str, key: Any, value: Any):
+        """Remove one value from a predicate index, dropping empty entries"""
+        values = index[predicate][key]
+        values.remove(value)
+        if not values:
+            del index[predicate][key]
+            if not index[predicate]:
+                del index[predicate]
+
+    @staticmethod
+    def _mentioned_entities(triple: Triple) -> List[str]:
+        """Entity ids a triple refers to (its subject, and its object unless that is a value)"""
+        _, subject, obj = triple
+        if isinstance(obj, str) and not isinstance(obj, Literal) and obj != subject:
+            return [subject, obj]
+        return [subject]
+
+    def _invalidate(self):
+        """Drop views derived from the triples"""
+        self._facts_cache = None
+        self._graph_cache = None
+        self._frame = None
+
+    def objects(self, predicate: str, subject: str) -> List[Any]:
+        """Objects of all (predicate, subject, ?) triples"""
+        return self._subject_index.get(predicate, {}).get(subject, [])
+
+    def subjects(self, predicate: str, obj: Any = None) -> List[str]:
+        """Subjects of (predicate, ?, obj) triples, or of any triple with predicate if obj is None"""
+        if obj is None:
+            return list(self._subject_index.get(predicate, {}))
+        return self._object_index.get(predicate, {}).get(obj, [])
         
     def add_pool(self, pool_data: Dict[str, Any]) -> List[str]:
         """
         Convert pool data to MeTTa facts
         Returns list of MeTTa statement strings
         """
+        triples = self._pool_triples(pool_data)
+        for triple in triples:
+            self.add_fact(*triple)
+        return [self._render(triple) for triple in triples]
+
+    def update_pools(self, pools_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Make the knowledge base describe exactly this pool snapshot
+        Only facts that differ are added or removed (typically the APY/TVL
+        values that moved since the last refresh), so unchanged pools cost
+        a set lookup each.
+
+        Args:
+            pools_data: Pools in add_pool format
+
+        Returns:
+            Graph delta:
+            {"since": previous version, "version": new version,
+             "nodes": {"added": [node], "updated": [node], "removed": [id]},
+             "edges": {"added": [edge], "removed": [edge]}}
+            version == since when nothing changed
+        """
+        desired: Dict[Triple, None] = {}
+        for pool_data in pools_data:
+            desired.update(dict.fromkeys(self._pool_triples(pool_data)))
+
+        added = [triple for triple in desired if triple not in self._triples]
+        removed = [triple for triple in self._triples if triple not in desired]
+
+        since = self.version
+        delta = {
+            "since": since,
+            "version": since,
+            "nodes": {"added": [], "updated": [], "removed": []},
+            "edges": {"added": [], "removed": []},
+        }
+        if not added and not removed:
+            return delta
+
+        touched = {entity for triple in added + removed for entity in self._mentioned_entities(triple)}
+        before = {
+            entity: dict(self._nodes[entity]["properties"])
+            for entity in touched if entity in self._nodes
+        }
+
+        # Add first: a changed value then replaces the old one in place on the node
+        for triple in added:
+            self.add_fact(*triple)
+        for triple in removed:
+            self.remove_fact(*triple)
+
+        self.version += 1
+        delta["version"] = self.version
+
+        for entity in touched:
+            node = self._nodes.get(entity)
+            if node is None:
+                if entity in before:
+                    delta["nodes"]["removed"].append(entity)
+            elif entity not in before:
+                delta["nodes"]["added"].append(self._copy_node(node))
+            elif node["properties"] != before[entity]:
+                delta["nodes"]["updated"].append(self._copy_node(node))
+
+        delta["edges"]["added"] = [self._edge(*triple) for triple in added if triple[0] in EDGE_PREDICATES]
+        delta["edges"]["removed"] = [self._edge(*triple) for triple in removed if triple[0] in EDGE_PREDICATES]
+        return delta
+
+    def _pool_triples(self, pool_data: Dict[str, Any]) -> List[Triple]:
+        """Triples describing one pool (see add_pool)"""
         # Clean identifiers
         project_clean = re.sub(r'[^a-zA-Z0-9]', '_', pool_data.get('project', 'unknown'))
         symbol_clean = re.sub(r'[^a-zA-Z0-9]', '_', pool_data.get('symbol', 'unknown'))
@@ -27,11 +267,11 @@ class DeFiKnowledgeBase:
         pool_id = f"pool_{project_clean}_{symbol_clean}"
         chain_id = f"chain_{chain_clean}"
         
-        facts = []
+        triples = []
         
         # Type declarations
-        facts.append(f"(: {pool_id} Pool)")
-        facts.append(f"(: {chain_id} Chain)")
+        triples.append((TYPE_PREDICATE, pool_id, "Pool"))
+        triples.append((TYPE_PREDICATE, chain_id, "Chain"))
         
         # Pool properties
         apy_total = pool_data.get('apy_total', 0)
@@ -40,24 +280,23 @@ class DeFiKnowledgeBase:
         tvl = pool_data.get('tvl', 0)
         pool_address = pool_data.get('pool_id', '')
         
-        facts.append(f"(hasAPY {pool_id} {apy_total:.2f})")
-        facts.append(f"(hasAPYBase {pool_id} {apy_base:.2f})")
-        facts.append(f"(hasAPYReward {pool_id} {apy_reward:.2f})")
-        facts.append(f"(hasTVL {pool_id} {tvl:.0f})")
-        facts.append(f"(onChain {pool_id} {chain_id})")
-        facts.append(f"(hasPoolAddress {pool_id} \"{pool_address}\")")
-        facts.append(f"(hasProject {pool_id} \"{pool_data.get('project', '')}\")")
-        facts.append(f"(hasSymbol {pool_id} \"{pool_data.get('symbol', '')}\")")
+        triples.append(("hasAPY", pool_id, float(apy_total)))
+        triples.append(("hasAPYBase", pool_id, float(apy_base)))
+        triples.append(("hasAPYReward", pool_id, float(apy_reward)))
+        triples.append(("hasTVL", pool_id, float(tvl)))
+        triples.append(("onChain", pool_id, chain_id))
+        triples.append(("hasPoolAddress", pool_id, Literal(pool_address)))
+        triples.append(("hasProject", pool_id, Literal(pool_data.get('project', ''))))
+        triples.append(("hasSymbol", pool_id, Literal(pool_data.get('symbol', ''))))
         
         # Add token relationships
         tokens = self._extract_tokens(pool_data.get('symbol', ''))
         for token in tokens:
             token_id = f"token_{token.upper()}"
-            facts.append(f"(: {token_id} Token)")
-            facts.append(f"(isInPool {token_id} {pool_id})")
-        
-        self.facts.extend(facts)
-        return facts
+            triples.append((TYPE_PREDICATE, token_id, "Token"))
+            triples.append(("isInPool", token_id, pool_id))
+
+        return triples
     
     def _extract_tokens(self, symbol: str) -> List[str]:
         """Extract individual tokens from pool symbol (e.g., 'USDC-SOL' -> ['USDC', 'SOL'])"""
@@ -75,75 +314,90 @@ class DeFiKnowledgeBase:
         tokens = [t.strip().upper() for t in tokens if t.strip()]
         return tokens
     
+    def add_rule(self, rule: str) -> List[str]:
+        """
+        Add MeTTa rule text, compiling each (= (name $p) body) it defines
+        Returns the names of the rules defined
+
+        Raises RuleError if the rule can't be parsed or compiled
+        """
+        compiled = compile_rules(rule)
+        self._compiled_rules.update(compiled)
+        self.rules.append(rule)
+        return list(compiled)
+
     def add_safety_rules(self):
         """Add reasoning rules for identifying safe pools"""
-        rules = [
-            """
-            (= (isSafePool $p)
-               (and
-                 (> (hasAPY $p) 7.0)
-                 (< (hasAPY $p) 15.0)
-                 (> (hasTVL $p) 1000000.0)))
-            """,
-            """
-            (= (isHighRiskPool $p)
-               (or
-                 (> (hasAPY $p) 50.0)
-                 (< (hasTVL $p) 100000.0)))
-            """,
-            """
-            (= (hasStableCoins $p)
-               (or
-                 (isInPool token_USDC $p)
-                 (isInPool token_USDT $p)
-                 (isInPool token_DAI $p)))
-            """,
-        ]
-        self.rules.extend(rules)
-        return rules
+        for rule in SAFETY_RULES:
+            self.add_rule(rule)
+        return list(SAFETY_RULES)
+
+    def evaluate_rule(self, name: str) -> List[str]:
+        """
+        Pools satisfying a rule, evaluated over all pools at once
+
+        Args:
+            name: Rule name, e.g. "isSafePool" (added rules override the defaults)
+
+        Returns:
+            Matching pool ids in insertion order
+        """
+        rules = {**DEFAULT_RULES, **self._compiled_rules}
+        rule = rules.get(name)
+        if rule is None:
+            raise KeyError(f"Unknown rule: {name}")
+
+        frame = self._pool_frame()
+        mask = rule.evaluate(frame, rules)
+        return [pool_id for pool_id, match in zip(frame.pool_ids, mask) if match]
+
+    def evaluate_rules(self, names: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Evaluate several rules (all known rules by default); returns name -> pool ids"""
+        if names is None:
+            names = list({**DEFAULT_RULES, **self._compiled_rules})
+        return {name: self.evaluate_rule(name) for name in names}
+
+    def _pool_frame(self) -> PoolFrame:
+        """Columnar pool view for rule evaluation, rebuilt after facts change"""
+        if self._frame is None:
+            self._frame = PoolFrame(self)
+        return self._frame
     
     def query_pools_by_token(self, token_symbol: str) -> List[str]:
         """Query pools containing a specific token"""
         token_id = f"token_{token_symbol.upper()}"
-        matching_pools = []
-        
-        for fact in self.facts:
-            if f"(isInPool {token_id}" in fact:
-                # Extract pool ID
-                match = re.search(r'\(isInPool \w+ (pool_\w+)\)', fact)
-                if match:
-                    matching_pools.append(match.group(1))
-        
-        return matching_pools
+        return list(self.objects("isInPool", token_id))
     
     def query_safe_pools(self) -> List[str]:
-        """Query pools that match safe criteria"""
-        safe_pools = []
-        
-        for fact in self.facts:
-            if fact.startswith("(hasAPY") and "Pool pool_" in fact:
-                # Extract pool ID and APY
-                match = re.search(r'\(hasAPY (pool_\w+) ([\d.]+)\)', fact)
-                if match:
-                    pool_id = match.group(1)
-                    apy = float(match.group(2))
-                    
-                    # Get TVL
-                    tvl = self._get_property(pool_id, "hasTVL")
-                    
-                    if 7.0 <= apy <= 15.0 and tvl >= 1000000.0:
-                        safe_pools.append(pool_id)
-        
-        return safe_pools
+        """Query pools that match safe criteria (isSafePool rule)"""
+        return self.evaluate_rule("isSafePool")
+
+    def query_high_risk_pools(self) -> List[str]:
+        """Query pools flagged by the isHighRiskPool rule"""
+        return self.evaluate_rule("isHighRiskPool")
+
+    def query_stable_coin_pools(self) -> List[str]:
+        """Query pools containing a stablecoin (hasStableCoins rule)"""
+        return self.evaluate_rule("hasStableCoins")
     
     def _get_property(self, entity_id: str, property_name: str) -> Optional[float]:
-        """Get a property value for an entity"""
-        for fact in self.facts:
-            if f"({property_name} {entity_id}" in fact:
-                match = re.search(r'\([\w-]+ \w+ ([\d.]+)\)', fact)
-                if match:
-                    return float(match.group(1))
+        """Get a numeric property value for an entity"""
+        for value in self.objects(property_name, entity_id):
+            if isinstance(value, float):
+                return value
         return None
+
+    @staticmethod
+    def _render(triple: Triple) -> str:
+        """Render a triple as a MeTTa statement"""
+        predicate, subject, obj = triple
+        if isinstance(obj, Literal):
+            value = f'"{obj}"'
+        elif isinstance(obj, float):
+            value = format(obj, NUMBER_FORMATS.get(predicate, "g"))
+        else:
+            value = obj
+        return f"({predicate} {subject} {value})"
     
     def to_metta_string(self) -> str:
         """Convert knowledge base to MeTTa language string"""
@@ -165,8 +419,7 @@ class DeFiKnowledgeBase:
         
         # Add facts
         output += "; Facts\n"
-        for fact in self.facts:
-            output += f"{fact}\n"
+        output += "".join(f"{fact}\n" for fact in self.facts)
         
         # Add rules
         output += "\n; Rules\n"
@@ -176,61 +429,79 @@ class DeFiKnowledgeBase:
         return output
     
     def get_graph_data(self) -> Dict[str, Any]:
-        """Extract nodes and edges for graph visualization"""
-        nodes = []
-        edges = []
-        
-        # Extract all entities
-        entities = set()
-        for fact in self.facts:
-            # Find entities in facts
-            matches = re.findall(r'(pool_\w+|token_\w+|chain_\w+)', fact)
-            entities.update(matches)
-        
-        # Create nodes
-        for entity in entities:
-            node_type = "pool" if entity.startswith("pool_") else \
-                       "token" if entity.startswith("token_") else "chain"
-            
-            # Get properties
-            properties = {}
-            for fact in self.facts:
-                if entity in fact:
-                    prop_match = re.search(r'\((\w+) ' + re.escape(entity) + r' (.+)\)', fact)
-                    if prop_match:
-                        prop_name = prop_match.group(1)
-                        prop_value = prop_match.group(2).strip('"')
-                        properties[prop_name] = prop_value
-            
-            nodes.append({
-                "id": entity,
-                "type": node_type,
-                "label": entity.replace("_", " ").title(),
-                "properties": properties
-            })
-        
-        # Create edges from relationships
-        for fact in self.facts:
-            if "(isInPool token_" in fact:
-                match = re.search(r'\(isInPool (token_\w+) (pool_\w+)\)', fact)
-                if match:
-                    edges.append({
-                        "from": match.group(1),
-                        "to": match.group(2),
-                        "relation": "isInPool"
-                    })
-            
-            if "(onChain pool_" in fact:
-                match = re.search(r'\(onChain (pool_\w+) (chain_\w+)\)', fact)
-                if match:
-                    edges.append({
-                        "from": match.group(1),
-                        "to": match.group(2),
-                        "relation": "onChain"
-                    })
-        
+        """
+        Extract nodes and edges for graph visualization
+        The payload is cached until facts change
+        """
+        if self._graph_cache is None:
+            self._graph_cache = {
+                "nodes": [self._copy_node(node) for node in self._nodes.values()],
+                "edges": list(self._edges.values())
+            }
+        return self._graph_cache
+
+    def _add_to_graph(self, predicate: str, subject: str, obj: Any):
+        """Update nodes, node properties and edges for a new triple"""
+        node = self._node(subject)
+        if isinstance(obj, str) and not isinstance(obj, Literal):
+            self._node(obj)
+
+        if predicate == TYPE_PREDICATE or node is None:
+            return
+
+        # Property values are shown as plain text (later facts win)
+        node["properties"][predicate] = self._display(predicate, obj)
+
+        if predicate in EDGE_PREDICATES:
+            self._edges[(predicate, subject, obj)] = self._edge(predicate, subject, obj)
+
+    def _remove_from_graph(self, predicate: str, subject: str, obj: Any):
+        """Undo _add_to_graph for a removed triple (nodes are pruned by remove_fact)"""
+        node = self._nodes.get(subject)
+        if predicate == TYPE_PREDICATE or node is None:
+            return
+
+        remaining = self.objects(predicate, subject)
+        if remaining:
+            node["properties"][predicate] = self._display(predicate, remaining[-1])
+        else:
+            node["properties"].pop(predicate, None)
+
+        self._edges.pop((predicate, subject, obj), None)
+
+    @staticmethod
+    def _display(predicate: str, obj: Any) -> str:
+        """Plain-text value of a property on a graph node"""
+        if isinstance(obj, float):
+            return format(obj, NUMBER_FORMATS.get(predicate, "g"))
+        return str(obj)
+
+    @staticmethod
+    def _edge(predicate: str, subject: str, obj: Any) -> Dict[str, str]:
         return {
-            "nodes": nodes,
-            "edges": edges
+            "from": subject,
+            "to": obj,
+            "relation": predicate
         }
 
+    @staticmethod
+    def _copy_node(node: Dict[str, Any]) -> Dict[str, Any]:
+        return {**node, "properties": dict(node["properties"])}
+
+    def _node(self, entity: str) -> Optional[Dict[str, Any]]:
+        """Get or create the graph node for an entity id (None if it isn't a graph entity)"""
+        node = self._nodes.get(entity)
+        if node is not None:
+            return node
+
+        for prefix, node_type in NODE_TYPES.items():
+            if entity.startswith(prefix):
+                node = {
+                    "id": entity,
+                    "type": node_type,
+                    "label": entity.replace("_", " ").title(),
+                    "properties": {}
+                }
+                self._nodes[entity] = node
+                return node
+        return None
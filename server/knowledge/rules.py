@@ -0,0 +1,231 @@
+"""
+MeTTa Rule Engine - Compiles rule definitions into vectorized pool predicates
+
+Rules of the form
+
+    (= (isSafePool $p)
+       (and (> (hasAPY $p) 7.0)
+            (< (hasAPY $p) 15.0)
+            (> (hasTVL $p) 1000000.0)))
+
+are parsed once and compiled into closures that evaluate the rule for every
+pool at once as a NumPy boolean mask over a PoolFrame (a columnar view of the
+knowledge base). Supported expressions:
+
+    (and e ...) (or e ...) (not e)          boolean logic
+    (> a b) (< a b) (>= a b) (<= a b) (== a b) (!= a b)
+    (predicate $p)                          numeric property column, or another rule
+    (relation constant $p)                  true where the triple exists, e.g.
+    (relation $p constant)                  (isInPool token_USDC $p), (onChain $p chain_Ethereum)
+    numbers                                 constants
+"""
+import re
+from typing import Dict, Any, List, Callable, Union, Optional
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r'\(|\)|"[^"]*"|[^\s()]+')
+
+COMPARISONS = {
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+Expr = Union[str, float, list]
+
+
+class RuleError(ValueError):
+    """Raised for rules that cannot be parsed or compiled"""
+
+
+class Quoted(str):
+    """String constant from a rule ("...")"""
+
+
+# ---------- parsing ----------
+
+def parse(text: str) -> List[Expr]:
+    """Parse MeTTa text into nested lists of atoms (numbers become floats)"""
+    text = "\n".join(line.split(";", 1)[0] for line in text.splitlines())
+    tokens = TOKEN_PATTERN.findall(text)
+
+    expressions = []
+    stack: List[list] = []
+    for token in tokens:
+        if token == "(":
+            stack.append([])
+        elif token == ")":
+            if not stack:
+                raise RuleError("Unexpected ')'")
+            expr = stack.pop()
+            (stack[-1] if stack else expressions).append(expr)
+        else:
+            atom = _atom(token)
+            (stack[-1] if stack else expressions).append(atom)
+
+    if stack:
+        raise RuleError("Unclosed '('")
+    return expressions
+
+
+def _atom(token: str) -> Expr:
+    if token.startswith('"'):
+        return Quoted(token[1:-1])
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+# ---------- evaluation view ----------
+
+class PoolFrame:
+    """Columnar view of the pools in a knowledge base, built lazily per column"""
+
+    def __init__(self, kb):
+        self.kb = kb
+        self.pool_ids: List[str] = kb.subjects(":", "Pool")
+        self.position = {pool_id: i for i, pool_id in enumerate(self.pool_ids)}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._relations: Dict[tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.pool_ids)
+
+    def column(self, predicate: str) -> np.ndarray:
+        """First numeric value of predicate per pool (NaN where missing)"""
+        column = self._columns.get(predicate)
+        if column is None:
+            column = np.fromiter(
+                (_first_number(self.kb.objects(predicate, pool_id)) for pool_id in self.pool_ids),
+                dtype=np.float64,
+                count=len(self.pool_ids)
+            )
+            self._columns[predicate] = column
+        return column
+
+    def relation(self, predicate: str, constant: str, pool_is_subject: bool) -> np.ndarray:
+        """Mask of pools p with (predicate p constant) or (predicate constant p)"""
+        key = (predicate, constant, pool_is_subject)
+        mask = self._relations.get(key)
+        if mask is None:
+            if pool_is_subject:
+                pools = self.kb.subjects(predicate, constant)
+            else:
+                pools = self.kb.objects(predicate, constant)
+            mask = np.zeros(len(self.pool_ids), dtype=bool)
+            rows = [self.position[p] for p in pools if p in self.position]
+            mask[rows] = True
+            self._relations[key] = mask
+        return mask
+
+
+def _first_number(values: List[Any]) -> float:
+    for value in values:
+        if isinstance(value, float):
+            return value
+    return np.nan
+
+
+# ---------- compilation ----------
+
+Evaluator = Callable[[PoolFrame, Dict[str, "Rule"]], Any]
+
+
+class Rule:
+    """A compiled rule: name, variable and a vectorized evaluator"""
+
+    def __init__(self, name: str, variable: str, evaluator: Evaluator, source: str = ""):
+        self.name = name
+        self.variable = variable
+        self.source = source
+        self._evaluator = evaluator
+
+    def evaluate(self, frame: PoolFrame, rules: Optional[Dict[str, "Rule"]] = None) -> np.ndarray:
+        """Boolean mask over frame.pool_ids"""
+        result = self._evaluator(frame, rules or {})
+        return np.broadcast_to(np.asarray(result, dtype=bool), (len(frame),))
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name} {self.variable})"
+
+
+def compile_rule(expr: Expr, source: str = "") -> Rule:
+    """Compile a parsed (= (name $var) body) expression"""
+    if not (isinstance(expr, list) and len(expr) == 3 and expr[0] == "="):
+        raise RuleError(f"Expected (= (name $var) body), got {expr!r}")
+
+    head, body = expr[1], expr[2]
+    if not (isinstance(head, list) and len(head) == 2 and _is_variable(head[1])):
+        raise RuleError(f"Rule head must be (name $var), got {head!r}")
+
+    name, variable = head
+    return Rule(name, variable, _compile(body, variable), source)
+
+
+def compile_rules(text: str) -> Dict[str, Rule]:
+    """Parse and compile every rule in a MeTTa text"""
+    return {rule.name: rule for rule in (compile_rule(expr, text) for expr in parse(text))}
+
+
+def _is_variable(atom: Expr) -> bool:
+    return isinstance(atom, str) and atom.startswith("$")
+
+
+def _compile(expr: Expr, variable: str) -> Evaluator:
+    if isinstance(expr, float):
+        return lambda frame, rules: expr
+    if not isinstance(expr, list) or not expr:
+        raise RuleError(f"Cannot evaluate {expr!r}")
+
+    op, args = expr[0], expr[1:]
+
+    if op == "and" or op == "or":
+        if not args:
+            raise RuleError(f"({op}) needs arguments")
+        parts = [_compile(arg, variable) for arg in args]
+        combine = np.logical_and if op == "and" else np.logical_or
+
+        def logical(frame, rules):
+            result = parts[0](frame, rules)
+            for part in parts[1:]:
+                result = combine(result, part(frame, rules))
+            return result
+        return logical
+
+    if op == "not":
+        if len(args) != 1:
+            raise RuleError("(not e) takes one argument")
+        part = _compile(args[0], variable)
+        return lambda frame, rules: np.logical_not(part(frame, rules))
+
+    if op in COMPARISONS:
+        if len(args) != 2:
+            raise RuleError(f"({op} a b) takes two arguments")
+        left, right = _compile(args[0], variable), _compile(args[1], variable)
+        compare = COMPARISONS[op]
+        return lambda frame, rules: compare(left(frame, rules), right(frame, rules))
+
+    # (predicate $p): numeric column or a reference to another rule
+    if len(args) == 1 and args[0] == variable:
+        def property_or_rule(frame, rules):
+            rule = rules.get(op)
+            if rule is not None:
+                return rule.evaluate(frame, rules)
+            return frame.column(op)
+        return property_or_rule
+
+    # (relation constant $p) / (relation $p constant)
+    if len(args) == 2 and variable in args:
+        other = args[1] if args[0] == variable else args[0]
+        if _is_variable(other) or isinstance(other, list):
+            raise RuleError(f"Unsupported relation pattern {expr!r}")
+        pool_is_subject = args[0] == variable
+        return lambda frame, rules: frame.relation(op, other, pool_is_subject)
+
+    raise RuleError(f"Unsupported expression {expr!r}")
@@ -0,0 +1,166 @@
+"""
+Benchmark the API server throughput
+
+Starts the production launcher (api/launcher.py) with its autotuned settings,
+or targets an already running server, and drives it with concurrent keep-alive
+clients for a fixed time. Reports requests/s and latency percentiles per path.
+
+Usage:
+    python scripts/benchmark_server.py                        # launcher, ASGI mode
+    python scripts/benchmark_server.py --mode wsgi
+    python scripts/benchmark_server.py --url http://localhost:5001 --concurrency 200
+    python scripts/benchmark_server.py --chat "what is impermanent loss"   # needs ASI_API_KEY
+
+The default paths exercise the server itself (routing, JSON, CORS, metrics);
+--chat adds POST /api/chat turns, which also measure the upstream LLM/tools.
+"""
+import os
+import sys
+import time
+import json
+import signal
+import asyncio
+import argparse
+import subprocess
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PATHS = ["/api/health", "/api/agents", "/api/metrics"]
+
+
+def start_launcher(mode: str, port: int) -> subprocess.Popen:
+    """Start api/launcher.py and wait until it answers /api/health"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "api.launcher", "--mode", mode, "--port", str(port)],
+        cwd=SERVER_DIR,
+        start_new_session=True,
+    )
+
+    url = f"http://127.0.0.1:{port}/api/health"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Launcher exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+
+    stop_launcher(process)
+    raise RuntimeError("Server did not become ready within 60s")
+
+
+def stop_launcher(process: subprocess.Popen):
+    """Stop gunicorn gracefully (SIGTERM to the master's process group)"""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+async def run_load(base_url: str, requests: List[Dict[str, Any]], concurrency: int, duration: float) -> Dict[str, Any]:
+    """Drive the server with `concurrency` clients cycling through requests for `duration` seconds"""
+    latencies: Dict[str, List[float]] = {request["name"]: [] for request in requests}
+    errors: Dict[str, int] = {request["name"]: 0 for request in requests}
+    stop_at = time.perf_counter() + duration
+
+    async def worker(offset: int):
+        # One keep-alive connection per client (a shared pool costs the client more CPU than the server)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            i = offset
+            while time.perf_counter() < stop_at:
+                request = requests[i % len(requests)]
+                i += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(request["method"], request["path"], json=request.get("json"))
+                    ok = response.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[request["name"]].append(time.perf_counter() - started)
+                else:
+                    errors[request["name"]] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    results = {}
+    for name, samples in latencies.items():
+        samples.sort()
+        results[name] = {
+            "requests": len(samples),
+            "errors": errors[name],
+            "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": _percentile_ms(samples, 0.50),
+            "p95_ms": _percentile_ms(samples, 0.95),
+            "p99_ms": _percentile_ms(samples, 0.99),
+        }
+
+    total = sum(len(samples) for samples in latencies.values())
+    return {"elapsed": round(elapsed, 2), "total_rps": round(total / elapsed, 1), "paths": results}
+
+
+def _percentile_ms(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    return round(samples[min(int(len(samples) * q), len(samples) - 1)] * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Superio API throughput")
+    parser.add_argument("--url", help="Benchmark a running server instead of starting the launcher")
+    parser.add_argument("--mode", choices=["asgi", "wsgi"], default="asgi")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load")
+    parser.add_argument("--path", action="append", help="GET path to request (repeatable)")
+    parser.add_argument("--chat", help="Also send this message to POST /api/chat")
+    args = parser.parse_args()
+
+    requests = [{"name": f"GET {path}", "method": "GET", "path": path} for path in (args.path or DEFAULT_PATHS)]
+    if args.chat:
+        requests.append({
+            "name": "POST /api/chat",
+            "method": "POST",
+            "path": "/api/chat",
+            "json": {"message": args.chat, "user_id": "anonymous"},
+        })
+
+    process = None
+    base_url = args.url
+    if not base_url:
+        sys.path.insert(0, SERVER_DIR)
+        from api.launcher import gunicorn_options
+
+        config = gunicorn_options(args.mode, args.port)
+        print(f"⚙️ Settings: {json.dumps(config['tuning'])}, worker class {config['options']['worker_class']}")
+        process = start_launcher(args.mode, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        # Warm up connections and caches before measuring
+        asyncio.run(run_load(base_url, requests, min(args.concurrency, 10), 2.0))
+
+        print(f"📊 {args.concurrency} concurrent clients for {args.duration:.0f}s against {base_url}")
+        report = asyncio.run(run_load(base_url, requests, args.concurrency, args.duration))
+    finally:
+        if process is not None:
+            stop_launcher(process)
+
+    print(f"\n{'path':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, stats in report["paths"].items():
+        print(f"{name:<24}{stats['rps']:>10}{str(stats['p50_ms']):>10}{str(stats['p95_ms']):>10}"
+              f"{str(stats['p99_ms']):>10}{stats['errors']:>8}")
+    print(f"\n✅ Total: {report['total_rps']} req/s over {report['elapsed']}s")
+
+
+if __name__ == "__main__":
+    main()
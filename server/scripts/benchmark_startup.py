@@ -0,0 +1,115 @@
+"""
+Benchmark API server startup time
+
+Starts the server repeatedly and measures the time from process start to the
+first 200 from /api/health (time-to-first-healthy). After each start it reads
+/api/metrics to show which lazily imported modules (Gemini, PIL) were loaded
+while booting; none should be until a chart is analyzed.
+
+Usage:
+    python scripts/benchmark_startup.py                     # dev server (api/server.py)
+    python scripts/benchmark_startup.py --mode asgi --runs 5
+    python scripts/benchmark_startup.py --mode dev --mode asgi --mode wsgi
+"""
+import os
+import sys
+import time
+import signal
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COMMANDS = {
+    "dev": lambda port: [sys.executable, "api/server.py"],
+    "asgi": lambda port: [sys.executable, "-m", "api.launcher", "--mode", "asgi", "--port", str(port)],
+    "wsgi": lambda port: [sys.executable, "-m", "api.launcher", "--mode", "wsgi", "--port", str(port)],
+}
+
+
+def measure_start(mode: str, port: int, timeout: float, quiet: bool) -> Dict[str, Any]:
+    """Start the server once and time it until /api/health answers 200"""
+    env = dict(os.environ, FLASK_PORT=str(port), PORT=str(port), PYTHONUNBUFFERED="1")
+    output = subprocess.DEVNULL if quiet else None
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        COMMANDS[mode](port),
+        cwd=SERVER_DIR,
+        env=env,
+        stdout=output,
+        stderr=output,
+        start_new_session=True,
+    )
+
+    url = f"http://127.0.0.1:{port}"
+    try:
+        while True:
+            elapsed = time.perf_counter() - started
+            if process.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with code {process.returncode}")
+            if elapsed > timeout:
+                raise RuntimeError(f"{mode} server not healthy within {timeout:.0f}s")
+            try:
+                if httpx.get(f"{url}/api/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+
+        lazy_modules = {}
+        try:
+            lazy_modules = httpx.get(f"{url}/api/metrics", timeout=10).json().get("lazy_modules", {})
+        except (httpx.HTTPError, ValueError):
+            pass
+
+        return {"seconds": elapsed, "lazy_modules": lazy_modules}
+    finally:
+        stop_server(process)
+
+
+def stop_server(process: subprocess.Popen):
+    """Stop the server and everything it started (its own process group)"""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except ProcessLookupError:
+        pass
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Superio API time-to-first-healthy")
+    parser.add_argument("--mode", action="append", choices=sorted(COMMANDS),
+                        help="Server to start (repeatable, default: dev)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=5098)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for a healthy server")
+    parser.add_argument("--verbose", action="store_true", help="Show server output")
+    args = parser.parse_args()
+
+    results: Dict[str, List[float]] = {}
+    for mode in args.mode or ["dev"]:
+        results[mode] = []
+        for run in range(1, args.runs + 1):
+            result = measure_start(mode, args.port, args.timeout, quiet=not args.verbose)
+            results[mode].append(result["seconds"])
+
+            loaded = [name for name, stats in result["lazy_modules"].items() if stats.get("loaded")]
+            print(f"⏱️ {mode} run {run}: healthy after {result['seconds'] * 1000:.0f}ms "
+                  f"(lazy modules loaded: {', '.join(loaded) or 'none'})")
+
+    print(f"\n{'mode':<8}{'runs':>6}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+    for mode, samples in results.items():
+        print(f"{mode:<8}{len(samples):>6}{min(samples) * 1000:>10.0f}"
+              f"{statistics.median(samples) * 1000:>12.0f}{max(samples) * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
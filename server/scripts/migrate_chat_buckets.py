@@ -0,0 +1,120 @@
+"""
+Migrate chat history to bucketed message storage
+
+Moves the `messages` array of every legacy chat_history document into
+fixed-size chat_messages buckets, merged ahead of any messages that were
+already written to buckets, and sets message_count on the header.
+
+Usage:
+    python scripts/migrate_chat_buckets.py --dry-run
+    python scripts/migrate_chat_buckets.py [--wallet 0x...] [--no-transaction]
+
+Each chat is migrated in a transaction (needs a replica set, e.g. Atlas).
+Run it while chat traffic is low: writes to a chat being migrated are retried
+by the persistence queue but may interleave with the rewrite.
+"""
+import os
+import sys
+import argparse
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+from db.chat_history_db import ChatHistoryDB, BUCKET_SIZE
+
+
+def build_buckets(wallet_address: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Renumber messages from 0 and split them into bucket documents"""
+    buckets: Dict[int, Dict[str, Any]] = {}
+    for seq, message in enumerate(messages):
+        bucket = buckets.setdefault(seq // BUCKET_SIZE, {
+            "wallet_address": wallet_address,
+            "bucket": seq // BUCKET_SIZE,
+            "count": 0,
+            "messages": [],
+        })
+        bucket["messages"].append({**message, "seq": seq})
+        bucket["count"] += 1
+    return [buckets[b] for b in sorted(buckets)]
+
+
+def migrate_chat(store: ChatHistoryDB, wallet_address: str, dry_run: bool, use_transaction: bool) -> int:
+    """Migrate one chat; returns the number of messages now in buckets"""
+
+    def run(session=None):
+        header = store.collection.find_one(
+            {"wallet_address": wallet_address, "messages": {"$exists": True}},
+            {"messages": 1},
+            session=session
+        )
+        if not header:
+            return 0
+
+        legacy = header.get("messages") or []
+        existing = ChatHistoryDB._ordered_messages(
+            store.messages.find({"wallet_address": wallet_address}, {"messages": 1, "_id": 0}, session=session)
+        )
+        combined = [{k: v for k, v in m.items() if k != "seq"} for m in legacy + existing]
+        buckets = build_buckets(wallet_address, combined)
+
+        print(f"  {wallet_address}: {len(legacy)} legacy + {len(existing)} bucketed -> {len(buckets)} buckets")
+        if dry_run:
+            return len(combined)
+
+        store.messages.delete_many({"wallet_address": wallet_address}, session=session)
+        if buckets:
+            store.messages.insert_many(buckets, session=session)
+        store.collection.update_one(
+            {"_id": header["_id"]},
+            {"$set": {"message_count": len(combined)}, "$unset": {"messages": ""}},
+            session=session
+        )
+        return len(combined)
+
+    if dry_run or not use_transaction:
+        return run()
+
+    with store.client.start_session() as session:
+        return session.with_transaction(run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate chat history to bucketed message storage")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--wallet", help="Only migrate this wallet address")
+    parser.add_argument("--no-transaction", action="store_true", help="Migrate without transactions (standalone MongoDB)")
+    args = parser.parse_args()
+
+    store = ChatHistoryDB()
+    if store.collection is None:
+        print("❌ MongoDB not available (is MONGODBURI set?)")
+        return 1
+
+    query: Dict[str, Any] = {"messages": {"$exists": True}}
+    if args.wallet:
+        query["wallet_address"] = args.wallet
+
+    wallets = [doc["wallet_address"] for doc in store.collection.find(query, {"wallet_address": 1})]
+    print(f"📊 {len(wallets)} legacy chats to migrate (bucket size {BUCKET_SIZE}){' [dry run]' if args.dry_run else ''}")
+
+    migrated = 0
+    failed = 0
+    total_messages = 0
+    for wallet_address in wallets:
+        try:
+            total_messages += migrate_chat(store, wallet_address, args.dry_run, not args.no_transaction)
+            migrated += 1
+        except Exception as e:
+            failed += 1
+            print(f"❌ Failed to migrate {wallet_address}: {e}")
+
+    print(f"✅ {'Checked' if args.dry_run else 'Migrated'} {migrated} chats ({total_messages} messages), {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
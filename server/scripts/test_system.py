@@ -1,11 +1,18 @@
 """
 Test script for Superio AI Backend
 Tests all components and agent communication
+
+Usage:
+    python scripts/test_system.py               # endpoint tests against a running server
+    python scripts/test_system.py --importtime  # import-time profile of server startup
 """
+import os
+import sys
 import requests
 import json
 import time
-from typing import Dict, Any
+import subprocess
+from typing import Dict, Any, List, Tuple
 
 
 API_URL = "http://localhost:5001"
@@ -201,6 +208,68 @@ def test_protocols() -> bool:
         return False
 
 
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) from `python -X importtime` output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def report_import_times(top: int = 15) -> bool:
+    """Profile importing the API server and warming up its handlers (-X importtime)"""
+    print_header("Import Time Profile")
+
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "from api.server import app; from api.startup import warm_up; warm_up(prefetch=False)"
+    started = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=server_dir,
+        capture_output=True,
+        text=True,
+        timeout=300
+    )
+    wall = time.time() - started
+
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0 or not rows:
+        print_error("Import failed:")
+        print(proc.stderr[-2000:])
+        return False
+
+    total_us = sum(self_us for _, self_us, _ in rows)
+    packages: Dict[str, int] = {}
+    for module, self_us, _ in rows:
+        package = module.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    print_info(f"{len(rows)} modules imported in {total_us / 1000:.0f}ms (process wall time {wall:.1f}s)")
+
+    print("\n  Slowest packages (self time, all submodules):")
+    for package, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"    {self_us / 1000:>8.1f}ms  {package}")
+
+    print("\n  Slowest modules (cumulative):")
+    for module, _, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"    {cumulative_us / 1000:>8.1f}ms  {module}")
+
+    # The warm-up summary printed by api/startup.py
+    for line in proc.stdout.splitlines():
+        if "Warm-up" in line:
+            print(f"\n  {line}")
+
+    return True
+
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -252,7 +321,9 @@ def run_all_tests():
 
 
 if __name__ == "__main__":
-    import sys
+    # Startup profile only: python scripts/test_system.py --importtime
+    if "--importtime" in sys.argv:
+        sys.exit(0 if report_import_times() else 1)
 
     # Check if API is reachable
     try:
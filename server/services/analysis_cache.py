@@ -0,0 +1,104 @@
+"""
+Yield Analysis Cache - Reuses LLM yield analyses for equivalent questions
+Keyed by the pool selection (snapshot version + filters), a coarse intent of
+the user's question and its remaining subject words (protocols, tokens), so
+"safe ETH pools?" and "show me safest eth pools" share one analysis until the
+pool snapshot refreshes, while "is aave safe?" and "is curve safe?" do not.
+"""
+import os
+import re
+from typing import Dict, Any, Optional, List, Callable, Hashable
+
+from services.ttl_cache import TTLCache
+
+
+# Intent classes, matched on whole words of the question
+INTENT_KEYWORDS = {
+    "risk": {"risk", "risks", "risky", "danger", "dangerous", "rug", "audit", "audited", "scam"},
+    "safe": {"safe", "safest", "safer", "secure", "conservative", "reliable", "trusted"},
+    "stable": {"stable", "stables", "stablecoin", "stablecoins"},
+    "max_yield": {"best", "highest", "top", "max", "maximum", "high", "most", "greatest", "biggest"},
+    "compare": {"compare", "comparison", "vs", "versus", "difference", "better"},
+    "beginner": {"beginner", "beginners", "new", "start", "starting", "easy", "simple"},
+}
+
+# Words that don't change what is being asked
+STOP_WORDS = {
+    "a", "an", "the", "me", "show", "find", "get", "give", "list", "what", "whats",
+    "which", "are", "is", "any", "some", "can", "you", "please", "i", "want", "to",
+    "for", "on", "in", "of", "with", "and", "pool", "pools", "yield", "yields",
+    "farm", "farming", "opportunities", "opportunity", "apy", "defi",
+}
+
+
+class YieldAnalysisCache:
+    """Memo of YieldAnalyzer.analyze_pools_with_ai results"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: Analyses kept
+            ttl: Seconds an analysis is reused (match the pool snapshot TTL)
+        """
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def query_intent(query: str) -> str:
+        """
+        Coarse intent of a yield question plus its subject words,
+        e.g. "safe|aave", "max_yield+stable|eth", "general|usdc"
+        Intent keywords collapse into their class; every other non-stop word
+        (protocol and token names) stays, so questions about different
+        subjects never share an answer
+        """
+        words = set(re.sub(r"[^a-z0-9]+", " ", query.lower().replace("'", "")).split())
+        intents = sorted(name for name, keywords in INTENT_KEYWORDS.items() if words & keywords)
+        intent_words = set().union(*INTENT_KEYWORDS.values())
+        subject = sorted(words - STOP_WORDS - intent_words)
+        return f"{'+'.join(intents) or 'general'}|{' '.join(subject)}"
+
+    def get_analysis(
+        self,
+        api_key: str,
+        pools: List[Dict[str, Any]],
+        user_query: str,
+        memo_key: Hashable,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Cached analysis for a pool selection and question, running the LLM on a miss
+
+        Args:
+            api_key: ASI API key
+            pools: Selected pools (as passed to analyze_pools_with_ai)
+            user_query: User's question
+            memo_key: Identifies the selection, e.g. (snapshot.version, filters)
+            on_token: Streaming callback; a cached analysis is sent as one chunk
+
+        Returns:
+            Analysis text or None
+        """
+        key = (memo_key, self.query_intent(user_query))
+        analysis = self._cache.get(key)
+        if analysis is not None:
+            print(f"♻️ Reusing yield analysis for intent '{key[1]}'")
+            if on_token:
+                on_token(analysis)
+            return analysis
+
+        from tools.yield_tools import YieldAnalyzer
+
+        analysis = YieldAnalyzer.analyze_pools_with_ai(api_key, pools, user_query, on_token=on_token)
+        if analysis:
+            self._cache.set(key, analysis)
+        return analysis
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+# Global instance (entries also key on the snapshot version, so a refresh starts fresh)
+yield_analysis_cache = YieldAnalysisCache(
+    maxsize=int(os.getenv("YIELD_ANALYSIS_CACHE_SIZE", 256)),
+    ttl=float(os.getenv("YIELD_POOLS_TTL", 300)),
+)
@@ -0,0 +1,90 @@
+"""
+Chat Context Cache - Recent messages and rendered prompt context per wallet
+Loaded from MongoDB on a cold miss, then kept current write-through by the
+chat endpoints so bursts of messages from one wallet don't load the history.
+Each hit checks the wallet's stored message count (one header read); if it
+moved past what this process has seen, another worker served the wallet and
+the messages are reloaded.
+"""
+import os
+from typing import Dict, List
+
+from services.ttl_cache import TTLCache
+
+
+class ChatContextCache:
+    """Per-wallet cache of the last few messages and their context string"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 120.0, window: int = 5, max_content: int = 500):
+        """
+        Args:
+            maxsize: Wallets kept in memory
+            ttl: Seconds before an idle wallet is reloaded from the database
+            window: Recent messages kept per wallet
+            max_content: Context character budget (ChatSummarizer.create_context_string max_chars)
+        """
+        self.window = window
+        self.max_content = max_content
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get_context(self, wallet_address: str) -> str:
+        """Rendered context string for a wallet, loading recent messages on a miss"""
+        from db.chat_history_db import db
+
+        entry = self._cache.get(wallet_address)
+        stored_count = db.get_message_count(wallet_address)
+
+        # Below the seen count only means this process's own writes are still queued
+        if entry is None or stored_count > entry["count"]:
+            messages = [self._compact(m) for m in db.get_recent_messages(wallet_address, limit=self.window)]
+            entry = self._entry(messages, stored_count)
+            self._cache.set(wallet_address, entry)
+        return entry["context"]
+
+    def add_message(self, wallet_address: str, role: str, content: str):
+        """
+        Record a new message for a cached wallet (write-through)
+        Wallets that aren't cached are loaded from the database on their next request
+        """
+        entry = self._cache.get(wallet_address)
+        if entry is None:
+            return
+
+        messages = (entry["messages"] + [self._compact({"role": role, "content": content})])[-self.window:]
+        self._cache.set(wallet_address, self._entry(messages, entry["count"] + 1))
+
+    def invalidate(self, wallet_address: str):
+        self._cache.pop(wallet_address)
+
+    def stats(self) -> Dict:
+        return self._cache.stats()
+
+    def _compact(self, message: Dict) -> Dict:
+        """Keep only what the context needs (metadata can be large)"""
+        # Longer messages never fit the context budget; one extra character keeps them excluded
+        return {
+            "role": message.get("role", "user"),
+            "content": (message.get("content") or "")[:self.max_content + 1],
+        }
+
+    @staticmethod
+    def _entry(messages: List[Dict], count: int) -> Dict:
+        """
+        Args:
+            messages: Recent messages, oldest first
+            count: Messages this process knows the wallet has (stored + its own writes)
+        """
+        from services.summarizer import ChatSummarizer
+
+        return {
+            "messages": messages,
+            "count": count,
+            "context": ChatSummarizer.create_context_string(messages),
+        }
+
+
+# Global instance
+context_cache = ChatContextCache(
+    maxsize=int(os.getenv("CONTEXT_CACHE_SIZE", 1000)),
+    ttl=float(os.getenv("CONTEXT_CACHE_TTL", 120)),
+)
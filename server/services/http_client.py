@@ -0,0 +1,296 @@
+"""
+Shared HTTP Transport - Pooled, long-lived connections for all outbound data providers
+Keeps keep-alive connection pools per upstream host, caps per-host concurrency,
+retries transient failures with jittered exponential backoff and tracks how
+often connections are reused
+"""
+import os
+import asyncio
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Status codes worth retrying (rate limits and transient upstream failures)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 in httpx needs the optional 'h2' package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _build_retry(total: int, backoff_factor: float, jitter: float) -> Retry:
+    """Retry policy with exponential backoff, jitter and Retry-After support"""
+    options = dict(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=jitter, **options)
+    except TypeError:
+        # urllib3 < 2.0 has no backoff_jitter
+        return Retry(**options)
+
+
+class HTTPClientPool:
+    """Process-wide HTTP transport shared by every API client"""
+
+    def __init__(
+        self,
+        pool_maxsize: int = 16,
+        host_concurrency: int = 16,
+        retries: int = 3,
+        backoff_factor: float = 0.3,
+        backoff_jitter: float = 0.5,
+        timeout: float = 15.0
+    ):
+        """
+        Args:
+            pool_maxsize: Keep-alive connections kept per host
+            host_concurrency: Maximum in-flight requests per host
+            retries: Retry attempts for connection errors and RETRY_STATUSES
+            backoff_factor: Base of the exponential backoff in seconds
+            backoff_jitter: Random jitter added to each backoff, in seconds
+            timeout: Default timeout for requests without an explicit one
+        """
+        self.pool_maxsize = pool_maxsize
+        self.host_concurrency = host_concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.timeout = timeout
+        self.http2 = _http2_available()
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._session: Optional[requests.Session] = None
+        self._httpx_client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_stats: Dict[str, Dict[str, int]] = {}
+
+    # ---------- requests (sync, HTTP/1.1 keep-alive) ----------
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session
+        Raises requests.RequestException like requests.request()
+        """
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", self.timeout)
+        session = self._get_session()
+        limit = self._host_limit(host)
+        stats = self._stats_for(host)
+
+        with limit:
+            with self._lock:
+                stats["in_flight"] += 1
+            try:
+                response = session.request(method, url, **kwargs)
+            except requests.RequestException:
+                with self._lock:
+                    stats["errors"] += 1
+                raise
+            finally:
+                with self._lock:
+                    stats["in_flight"] -= 1
+                    stats["requests"] += 1
+
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            with self._lock:
+                stats["retries"] += len(retries.history)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the shared session"""
+        return self.request("POST", url, **kwargs)
+
+    # ---------- httpx (HTTP/2 where the host supports it) ----------
+
+    def httpx_client(self) -> httpx.Client:
+        """Shared synchronous httpx client"""
+        self._check_fork()
+        with self._lock:
+            if self._httpx_client is None:
+                self._httpx_client = httpx.Client(
+                    timeout=self.timeout,
+                    transport=httpx.HTTPTransport(http2=self.http2, retries=self.retries, limits=self._httpx_limits()),
+                    event_hooks={"request": [self._count_httpx_request]},
+                )
+            return self._httpx_client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Shared async httpx client
+        Must only be used from coroutines running on the I/O loop (see run_async)
+        """
+        self._check_fork()
+        with self._lock:
+            if self._async_client is None:
+                self._async_client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    transport=httpx.AsyncHTTPTransport(http2=self.http2, retries=self.retries, limits=self._httpx_limits()),
+                    event_hooks={"request": [self._count_httpx_request_async]},
+                )
+            return self._async_client
+
+    def run_async(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the shared I/O event loop and wait for its result
+        Lets synchronous request handlers use the pooled async client
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        try:
+            return future.result(timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    # ---------- metrics ----------
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Per-host request counts and connection reuse
+        connection_reuse_ratio covers the requests session; httpx traffic
+        (Blockscout MCP) is reported separately as httpx_requests
+        """
+        connections = self._connections_per_host()
+        with self._lock:
+            hosts = {}
+            for host, stats in self._host_stats.items():
+                opened = connections.get(host)
+                entry = dict(stats)
+                if opened is not None:
+                    entry["connections_opened"] = opened
+                    entry["connection_reuse_ratio"] = round(1 - opened / stats["requests"], 3) if stats["requests"] else None
+                hosts[host] = entry
+
+            return {
+                "http2_enabled": self.http2,
+                "pool_maxsize": self.pool_maxsize,
+                "host_concurrency": self.host_concurrency,
+                "retries": self.retries,
+                "hosts": hosts,
+            }
+
+    # ---------- internals ----------
+
+    def _check_fork(self):
+        """Drop connections, clients and the I/O loop inherited from a parent process"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid != pid:
+                self._pid = pid
+                self._session = None
+                self._httpx_client = None
+                self._async_client = None
+                self._loop = None
+                self._host_limits = {}
+
+    def _get_session(self) -> requests.Session:
+        """Shared requests session with pooled, retrying adapters"""
+        self._check_fork()
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=self.pool_maxsize,
+                    max_retries=_build_retry(self.retries, self.backoff_factor, self.backoff_jitter),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Background event loop that owns the async client"""
+        self._check_fork()
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="http-io-loop", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _host_limit(self, host: str) -> threading.BoundedSemaphore:
+        """Per-host concurrency limiter"""
+        with self._lock:
+            limit = self._host_limits.get(host)
+            if limit is None:
+                limit = threading.BoundedSemaphore(self.host_concurrency)
+                self._host_limits[host] = limit
+            return limit
+
+    def _stats_for(self, host: str) -> Dict[str, int]:
+        with self._lock:
+            stats = self._host_stats.get(host)
+            if stats is None:
+                stats = {"requests": 0, "httpx_requests": 0, "errors": 0, "retries": 0, "in_flight": 0}
+                self._host_stats[host] = stats
+            return stats
+
+    def _httpx_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.host_concurrency * 4,
+            max_keepalive_connections=self.pool_maxsize,
+        )
+
+    def _count_httpx_request(self, request: httpx.Request):
+        stats = self._stats_for(request.url.netloc.decode())
+        with self._lock:
+            stats["httpx_requests"] += 1
+
+    async def _count_httpx_request_async(self, request: httpx.Request):
+        self._count_httpx_request(request)
+
+    def _connections_per_host(self) -> Dict[str, int]:
+        """Connections opened so far by the requests session, per host"""
+        session = self._session
+        if session is None:
+            return {}
+
+        opened: Dict[str, int] = {}
+        adapter = session.get_adapter("https://")
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            opened[host] = opened.get(host, 0) + pool.num_connections
+        return opened
+
+
+# Global instance
+http_pool = HTTPClientPool(
+    pool_maxsize=int(os.getenv("HTTP_POOL_MAXSIZE", 16)),
+    host_concurrency=int(os.getenv("HTTP_HOST_CONCURRENCY", 16)),
+    retries=int(os.getenv("HTTP_RETRIES", 3)),
+)
@@ -0,0 +1,101 @@
+"""
+Knowledge Cache - MeTTa knowledge bases built once per distinct pool set
+Entries are keyed by a content hash of the pools that go into the KB, so the
+same graph is shared by every request (and every snapshot) with identical data.
+The hash doubles as the ETag for conditional requests.
+"""
+import os
+import json
+import hashlib
+from typing import Dict, Any, Optional, List, Hashable
+
+from services.ttl_cache import TTLCache
+
+
+def _kb_fields(pool: Dict[str, Any]) -> tuple:
+    """The pool fields create_metta_knowledge_base uses, rounded the same way"""
+    apy_base = pool.get('apy', 0) or 0
+    apy_reward = pool.get('apyReward', 0) or 0
+    return (
+        pool.get('pool', ''),
+        pool.get('project', 'Unknown'),
+        pool.get('symbol', 'Unknown'),
+        pool.get('chain', 'Unknown'),
+        round(apy_base + apy_reward, 2),
+        round(apy_base, 2),
+        round(apy_reward, 2),
+        round(pool.get('tvlUsd', 0) or 0, 0),
+    )
+
+
+class KnowledgeCache:
+    """Content-addressed cache of knowledge base payloads"""
+
+    def __init__(self, maxsize: int = 32, ttl: float = 900.0):
+        """
+        Args:
+            maxsize: Distinct pool sets kept
+            ttl: Seconds an unused knowledge base is kept
+        """
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # (snapshot version, query) -> content hash, so repeat queries skip hashing
+        self._fingerprints = TTLCache(maxsize=maxsize * 8, ttl=ttl)
+        self._builds = 0
+
+    @staticmethod
+    def fingerprint(pools: List[Dict[str, Any]]) -> str:
+        """Content hash of a pool list (order-sensitive, like the KB itself)"""
+        digest = hashlib.sha256()
+        for pool in pools:
+            digest.update(repr(_kb_fields(pool)).encode())
+        return digest.hexdigest()[:32]
+
+    def get_knowledge(self, pools: List[Dict[str, Any]], memo_key: Optional[Hashable] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the knowledge base for a pool list, building it on first use
+
+        Args:
+            pools: DeFiLlama pools to put in the knowledge base
+            memo_key: Identifies how pools were selected, e.g. (snapshot.version, filters);
+                      lets repeat requests skip hashing the pool list
+
+        Returns:
+            {"etag": content hash, "knowledge": create_metta_knowledge_base() result,
+             "body": knowledge serialized as JSON} or None if the build failed
+        """
+        etag = self._fingerprints.get(memo_key) if memo_key is not None else None
+        if etag is None:
+            etag = self.fingerprint(pools)
+            if memo_key is not None:
+                self._fingerprints.set(memo_key, etag)
+
+        entry = self._entries.get(etag)
+        if entry is not None:
+            return entry
+
+        from tools.yield_tools import YieldAnalyzer
+
+        knowledge = YieldAnalyzer.create_metta_knowledge_base(pools)
+        if not knowledge:
+            return None
+
+        entry = {
+            "etag": etag,
+            "knowledge": knowledge,
+            "body": json.dumps(knowledge, default=str),
+        }
+        self._entries.set(etag, entry)
+        self._builds += 1
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._entries.stats(),
+            "builds": self._builds,
+        }
+
+
+# Global instance
+knowledge_cache = KnowledgeCache(
+    maxsize=int(os.getenv("KNOWLEDGE_CACHE_SIZE", 32)),
+)
@@ -0,0 +1,68 @@
+"""
+Lazy Imports - Heavy optional dependencies loaded on first use
+`genai = lazy_import("google.generativeai")` binds a proxy at module import; the
+real module is imported (once, thread-safe) the first time an attribute is used,
+so processes that never analyze a chart never pay for the Gemini/PIL stacks.
+"""
+import time
+import threading
+import importlib
+from typing import Dict, Any, Optional
+
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._load_ms: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def _load(self):
+        module = self._module
+        if module is not None:
+            return module
+
+        with self._lock:
+            if self._module is None:
+                started = time.perf_counter()
+                # ImportError propagates to the first caller, like a normal import
+                self._module = importlib.import_module(self._name)
+                self._load_ms = round((time.perf_counter() - started) * 1000, 1)
+                print(f"📦 Loaded {self._name} on first use ({self._load_ms:.0f}ms)")
+            return self._module
+
+    def stats(self) -> Dict[str, Any]:
+        return {"loaded": self.loaded, "load_ms": self._load_ms}
+
+
+_registry: Dict[str, LazyModule] = {}
+_registry_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Shared lazy proxy for a module (one per module name)"""
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = LazyModule(name)
+            _registry[name] = module
+        return module
+
+
+def lazy_import_stats() -> Dict[str, Any]:
+    """Which lazy modules have been loaded and how long each import took"""
+    with _registry_lock:
+        return {name: module.stats() for name, module in _registry.items()}
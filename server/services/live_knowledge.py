@@ -0,0 +1,156 @@
+"""
+Live Knowledge Graph - One long-lived MeTTa knowledge base per pool selection
+Each pool snapshot refresh is applied as an incremental update, and the
+resulting graph deltas are kept in a short log so clients can poll for
+changes since the version they hold instead of re-downloading the graph.
+"""
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, List, Hashable
+
+from services.ttl_cache import TTLCache
+
+
+class LiveKnowledgeGraph:
+    """Knowledge base kept in sync with pool snapshots, with a bounded delta log"""
+
+    def __init__(self, max_deltas: int = 50):
+        """
+        Args:
+            max_deltas: Deltas kept; clients further behind get the full graph
+        """
+        from knowledge.defi_knowledge import DeFiKnowledgeBase
+
+        self.kb = DeFiKnowledgeBase()
+        self.kb.add_safety_rules()
+        self.source_version: Optional[int] = None
+        self._deltas = deque(maxlen=max_deltas)
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self.kb.version
+
+    def sync(self, pools: List[Dict[str, Any]], source_version: int) -> int:
+        """
+        Apply a pool selection from snapshot source_version (no-op if already applied)
+
+        Returns:
+            Current graph version
+        """
+        from tools.yield_tools import YieldAnalyzer
+
+        with self._lock:
+            if source_version == self.source_version:
+                return self.kb.version
+
+            delta = self.kb.update_pools([YieldAnalyzer.to_kb_pool(pool) for pool in pools])
+            self.source_version = source_version
+            if delta["version"] != delta["since"]:
+                self._deltas.append(delta)
+                print(f"♻️ Knowledge graph v{delta['version']}: "
+                      f"{len(delta['nodes']['added'])} nodes added, "
+                      f"{len(delta['nodes']['updated'])} updated, "
+                      f"{len(delta['nodes']['removed'])} removed")
+            return self.kb.version
+
+    def graph(self) -> Dict[str, Any]:
+        """Full graph at the current version"""
+        with self._lock:
+            return {
+                "version": self.kb.version,
+                "graph_data": self.kb.get_graph_data(),
+            }
+
+    def delta_since(self, since: int) -> Optional[Dict[str, Any]]:
+        """
+        Changes from version `since` to the current version, merged into one delta
+
+        Returns:
+            Delta in DeFiKnowledgeBase.update_pools format, or None if `since`
+            is unknown or older than the log (the client needs the full graph)
+        """
+        with self._lock:
+            version = self.kb.version
+            if since == version:
+                return self._merge([], since, version)
+            if since > version or not self._deltas or since < self._deltas[0]["since"]:
+                return None
+
+            return self._merge([d for d in self._deltas if d["since"] >= since], since, version)
+
+    @staticmethod
+    def _merge(deltas: List[Dict[str, Any]], since: int, version: int) -> Dict[str, Any]:
+        """Fold consecutive deltas into one (an add then a remove cancels out)"""
+        nodes: Dict[str, tuple] = {}  # id -> (state, node)
+        edges: Dict[tuple, tuple] = {}  # (from, to, relation) -> (state, edge)
+
+        for delta in deltas:
+            for node in delta["nodes"]["added"]:
+                previous = nodes.get(node["id"], (None,))[0]
+                nodes[node["id"]] = ("updated" if previous == "removed" else "added", node)
+            for node in delta["nodes"]["updated"]:
+                previous = nodes.get(node["id"], (None,))[0]
+                nodes[node["id"]] = ("added" if previous == "added" else "updated", node)
+            for node_id in delta["nodes"]["removed"]:
+                previous = nodes.get(node_id, (None,))[0]
+                if previous == "added":
+                    del nodes[node_id]
+                else:
+                    nodes[node_id] = ("removed", node_id)
+
+            for state in ("added", "removed"):
+                for edge in delta["edges"][state]:
+                    key = (edge["from"], edge["to"], edge["relation"])
+                    if key in edges and edges[key][0] != state:
+                        del edges[key]
+                    else:
+                        edges[key] = (state, edge)
+
+        merged = {
+            "since": since,
+            "version": version,
+            "nodes": {"added": [], "updated": [], "removed": []},
+            "edges": {"added": [], "removed": []},
+        }
+        for state, node in nodes.values():
+            merged["nodes"][state].append(node)
+        for state, edge in edges.values():
+            merged["edges"][state].append(edge)
+        return merged
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.kb.version,
+            "source_version": self.source_version,
+            "deltas": len(self._deltas),
+        }
+
+
+class LiveKnowledgeGraphs:
+    """Live graphs keyed by how their pools are selected (e.g. the limit)"""
+
+    def __init__(self, maxsize: int = 8, ttl: float = 3600.0, max_deltas: int = 50):
+        self.max_deltas = max_deltas
+        self._graphs = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> LiveKnowledgeGraph:
+        """Live graph for a selection key, created on first use"""
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is None:
+                graph = LiveKnowledgeGraph(max_deltas=self.max_deltas)
+            # Re-set on every use so active graphs don't expire
+            self._graphs.set(key, graph)
+            return graph
+
+    def stats(self) -> Dict[str, Any]:
+        return self._graphs.stats()
+
+
+# Global instance
+live_graphs = LiveKnowledgeGraphs(
+    max_deltas=int(os.getenv("KNOWLEDGE_DELTA_LOG_SIZE", 50)),
+)
@@ -0,0 +1,193 @@
+"""
+LLM Client Registry - One long-lived OpenAI/ASI client per (API key, base URL)
+Reuses connections across requests, applies per-model timeouts and records
+time-to-first-byte, total latency and token usage per call site
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+
+
+ASI_BASE_URL = "https://api.asi1.ai/v1"
+
+# Default request timeouts per model (seconds); override with LLM_TIMEOUT_<MODEL>
+DEFAULT_MODEL_TIMEOUTS = {
+    "asi1-mini": 30.0,
+}
+
+# Latency samples kept per call site for percentiles
+LATENCY_WINDOW = 200
+
+
+class CallSiteStats:
+    """Latency and token counters for one call site"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.ttfbs = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency: float, ttfb: Optional[float], usage: Any, error: bool):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.latencies.append(latency)
+        if ttfb is not None:
+            self.ttfbs.append(ttfb)
+        if usage is not None:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_avg_ms": _avg_ms(self.latencies),
+            "latency_p95_ms": _p95_ms(self.latencies),
+            "ttfb_avg_ms": _avg_ms(self.ttfbs),
+            "ttfb_p95_ms": _p95_ms(self.ttfbs),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+def _avg_ms(samples) -> Optional[float]:
+    return round(sum(samples) / len(samples) * 1000, 1) if samples else None
+
+
+def _p95_ms(samples) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 1)
+
+
+class LLMClientRegistry:
+    """Process-wide registry of OpenAI-compatible clients with instrumentation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._clients: Dict[Tuple[str, str], OpenAI] = {}
+        self._stats: Dict[str, CallSiteStats] = {}
+        self._current = threading.local()
+
+    def get_client(self, api_key: Optional[str] = None, base_url: str = ASI_BASE_URL) -> OpenAI:
+        """
+        Get the shared client for an API key (defaults to ASI_API_KEY)
+        Clients are created once and keep their connection pool between requests
+        """
+        api_key = api_key or os.getenv("ASI_API_KEY")
+        key = (api_key, base_url)
+
+        pid = os.getpid()
+        with self._lock:
+            if self._pid != pid:
+                # Connection pools must not be shared with a parent process
+                self._pid = pid
+                self._clients = {}
+
+            client = self._clients.get(key)
+            if client is None:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", 100)), max_keepalive_connections=20),
+                        event_hooks={"response": [self._mark_first_byte]},
+                    ),
+                )
+                self._clients[key] = client
+            return client
+
+    def timeout_for(self, model: str) -> float:
+        """Request timeout for a model (LLM_TIMEOUT_<MODEL> or LLM_TIMEOUT env override)"""
+        env_name = "LLM_TIMEOUT_" + model.upper().replace("-", "_").replace(".", "_")
+        value = os.getenv(env_name) or os.getenv("LLM_TIMEOUT")
+        if value:
+            return float(value)
+        return DEFAULT_MODEL_TIMEOUTS.get(model, 60.0)
+
+    def chat_completion(self, call_site: str, client: Optional[OpenAI] = None, **kwargs) -> Any:
+        """
+        client.chat.completions.create with the model timeout and instrumentation
+
+        Args:
+            call_site: Name under which latency and tokens are recorded
+            client: Client to use (default: shared ASI client)
+            **kwargs: Arguments for chat.completions.create
+
+        Returns:
+            The completion, or a chunk iterator when stream=True
+        """
+        client = client or self.get_client()
+        kwargs.setdefault("timeout", self.timeout_for(kwargs.get("model", "")))
+
+        self._current.first_byte_at = None
+        started = time.perf_counter()
+        try:
+            result = client.chat.completions.create(**kwargs)
+        except Exception:
+            self._record(call_site, started, usage=None, error=True)
+            raise
+
+        if kwargs.get("stream"):
+            return self._instrument_stream(call_site, started, result)
+
+        self._record(call_site, started, usage=getattr(result, "usage", None), error=False)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Per call site latency, time-to-first-byte and token usage"""
+        with self._lock:
+            return {
+                "clients": len(self._clients),
+                "call_sites": {name: stats.summary() for name, stats in self._stats.items()},
+            }
+
+    def _instrument_stream(self, call_site: str, started: float, stream):
+        """Yield chunks, recording the first chunk as time-to-first-byte"""
+        first_chunk_at = None
+        usage = None
+        error = False
+        try:
+            for chunk in stream:
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                usage = getattr(chunk, "usage", None) or usage
+                yield chunk
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._current.first_byte_at = first_chunk_at
+            self._record(call_site, started, usage=usage, error=error)
+
+    def _record(self, call_site: str, started: float, usage: Any, error: bool):
+        finished = time.perf_counter()
+        first_byte_at = getattr(self._current, "first_byte_at", None)
+        ttfb = first_byte_at - started if first_byte_at else None
+
+        with self._lock:
+            stats = self._stats.get(call_site)
+            if stats is None:
+                stats = CallSiteStats()
+                self._stats[call_site] = stats
+            stats.record(finished - started, ttfb, usage, error)
+
+    def _mark_first_byte(self, response: httpx.Response):
+        """httpx hook: response headers received"""
+        if getattr(self._current, "first_byte_at", None) is None:
+            self._current.first_byte_at = time.perf_counter()
+
+
+# Global instance
+llm_registry = LLMClientRegistry()
@@ -0,0 +1,162 @@
+"""
+Market Data Cache - Shared cache for CoinGecko and Fear & Greed Index responses
+Each endpoint has its own TTL, concurrent misses for the same key share one
+upstream request, and when a refresh fails (CoinGecko free-tier 429s) the last
+good value keeps being served for a while instead of an error.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Hashable, Union
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "expires_at")
+
+    def __init__(self, value: Any, fetched_at: float, expires_at: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+
+
+class MarketDataCache:
+    """TTL cache with single-flight loading and stale-on-error"""
+
+    def __init__(self, maxsize: int = 512, max_stale: float = 3600.0, error_backoff: float = 15.0, wait_timeout: float = 15.0):
+        """
+        Args:
+            maxsize: Keys kept (least recently used evicted)
+            max_stale: Seconds past expiry a value may still be served when refreshing fails
+            error_backoff: Seconds to keep serving a stale value before retrying a failed refresh
+            wait_timeout: Seconds a request waits for another thread's in-flight load
+        """
+        self.maxsize = maxsize
+        self.max_stale = max_stale
+        self.error_backoff = error_backoff
+        self.wait_timeout = wait_timeout
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "coalesced": 0, "stale_served": 0, "errors": 0}
+
+    def fetch(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Union[float, Callable[[Any], float]],
+        default: Any = None
+    ) -> Any:
+        """
+        Get a value, loading it with loader() when missing or expired
+
+        Args:
+            key: Cache key, e.g. ("coin", "bitcoin")
+            loader: Fetches the value; raising or returning None counts as a failure
+            ttl: Seconds the value stays fresh, or a function of the value
+            default: Returned when loading fails and there is nothing stale to serve
+
+        Returns:
+            Fresh value, stale value (on upstream failure) or default
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self._metrics["hits"] += 1
+                return entry.value
+
+            event = self._inflight.get(key)
+            loading = event is None
+            if loading:
+                event = threading.Event()
+                self._inflight[key] = event
+                self._metrics["misses"] += 1
+            elif entry is not None and now - entry.expires_at <= self.max_stale:
+                # Someone else is refreshing: keep serving the previous value meanwhile
+                self._metrics["stale_served"] += 1
+                return entry.value
+            else:
+                self._metrics["coalesced"] += 1
+
+        if not loading:
+            # Wait for the in-flight load and take its result
+            event.wait(self.wait_timeout)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or time.monotonic() - entry.expires_at > self.max_stale:
+                    return default
+                return entry.value
+
+        try:
+            value = self._load(key, loader, ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+        return default if value is None else value
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: Union[float, Callable[[Any], float]]) -> Any:
+        """Run the loader and store the result; on failure fall back to the stale value"""
+        error = None
+        try:
+            value = loader()
+        except Exception as e:
+            value, error = None, e
+
+        now = time.monotonic()
+        with self._lock:
+            if value is not None:
+                seconds = ttl(value) if callable(ttl) else ttl
+                self._entries[key] = _Entry(value, time.time(), now + seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                return value
+
+            self._metrics["errors"] += 1
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.expires_at <= self.max_stale:
+                # Back off: keep serving the stale value before trying upstream again
+                entry.expires_at = now + self.error_backoff
+                self._metrics["stale_served"] += 1
+                print(f"⚠️ Serving stale market data for {key} ({int(time.time() - entry.fetched_at)}s old): {error or 'no data'}")
+                return entry.value
+
+        print(f"❌ Market data unavailable for {key}: {error or 'no data'}")
+        return None
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the cached value for key was fetched (None if not cached)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return time.time() - entry.fetched_at if entry else None
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": round(self._metrics["hits"] / lookups, 3) if lookups else None,
+            }
+
+
+# Per-endpoint freshness (seconds)
+PRICE_TTL = float(os.getenv("MARKET_PRICE_TTL", 30))
+TRENDING_TTL = float(os.getenv("MARKET_TRENDING_TTL", 300))
+CHART_TTL = float(os.getenv("MARKET_CHART_TTL", 300))
+
+# Global instance
+market_cache = MarketDataCache(
+    max_stale=float(os.getenv("MARKET_MAX_STALE", 3600)),
+    error_backoff=float(os.getenv("MARKET_ERROR_BACKOFF", 15)),
+)
@@ -0,0 +1,248 @@
+"""
+Persistence Queue - Write-behind queue for chat messages and summaries
+Chat requests enqueue their writes and return; a background worker batches
+them per wallet, retries failed writes with backoff and drains on shutdown
+"""
+import os
+import atexit
+import queue
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+
+class PersistenceQueue:
+    """Bounded, batched write-behind queue in front of ChatHistoryDB"""
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.2,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        put_timeout: float = 5.0
+    ):
+        """
+        Args:
+            maxsize: Jobs buffered before the caller waits for room
+            batch_size: Maximum jobs written per batch
+            flush_interval: Seconds to wait for more jobs before writing a batch
+            max_retries: Attempts per batch after the first failure
+            backoff: Base of the exponential retry backoff in seconds
+            put_timeout: Seconds a caller waits for room in a full queue before the write is dropped
+        """
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.put_timeout = put_timeout
+
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "full_waits": 0,
+            "retries": 0,
+            "dropped": 0,
+            "summary_jobs": 0,
+        }
+
+    def enqueue_message(self, wallet_address: str, role: str, content: str, metadata: Optional[Dict] = None) -> bool:
+        """
+        Queue a chat message for saving
+        Returns False if the message could not be saved
+        """
+        from db.chat_history_db import ChatHistoryDB
+
+        message = ChatHistoryDB.new_message(role, content, metadata)
+        return self._put({"type": "message", "wallet_address": wallet_address, "message": message})
+
+    def enqueue_summary(self, wallet_address: str, client) -> bool:
+        """Queue a summary refresh (runs after the wallet's pending messages are written)"""
+        return self._put({"type": "summary", "wallet_address": wallet_address, "client": client})
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued job has been processed"""
+        jobs = self._queue
+        if jobs is None:
+            return True
+
+        deadline = time.time() + timeout if timeout is not None else None
+        while jobs.unfinished_tasks:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def shutdown(self, timeout: float = 10.0):
+        """Drain pending writes (registered with atexit)"""
+        if self._queue is None or self._pid != os.getpid():
+            return
+
+        pending = self._queue.qsize()
+        if pending:
+            print(f"💾 Draining {pending} pending chat writes...")
+        if not self.flush(timeout):
+            print(f"⚠️ {self._queue.qsize()} chat writes not persisted before shutdown")
+        self._stopping = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue metrics for monitoring"""
+        with self._lock:
+            return {
+                **self._metrics,
+                "pending": self._queue.qsize() if self._queue is not None else 0,
+                "maxsize": self.maxsize,
+            }
+
+    def _put(self, job: Dict[str, Any]) -> bool:
+        jobs = self._get_queue()
+        with self._lock:
+            self._metrics["enqueued"] += 1
+
+        try:
+            jobs.put_nowait(job)
+            return True
+        except queue.Full:
+            if job["type"] == "summary":
+                # Summaries are refreshed again on a later message
+                return False
+
+        # Back-pressure: wait for room rather than write inline, which would
+        # store this message ahead of the wallet's earlier queued messages
+        with self._lock:
+            self._metrics["full_waits"] += 1
+        try:
+            jobs.put(job, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._metrics["dropped"] += 1
+            print(f"❌ Chat persistence queue full for {self.put_timeout:g}s - dropped a message for {job['wallet_address'][:10]}...")
+            return False
+
+    def _get_queue(self) -> queue.Queue:
+        """Queue and worker thread for this process (recreated after fork)"""
+        pid = os.getpid()
+        with self._lock:
+            if self._pid != pid:
+                self._pid = pid
+                self._queue = queue.Queue(maxsize=self.maxsize)
+                self._stopping = False
+                self._worker = threading.Thread(target=self._run, name="chat-persistence", daemon=True)
+                self._worker.start()
+            return self._queue
+
+    def _run(self):
+        jobs = self._queue
+        while not self._stopping:
+            try:
+                batch = [jobs.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+
+            # Collect more jobs for the same batch
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(jobs.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                print(f"❌ Chat persistence worker error: {e}")
+            finally:
+                for _ in batch:
+                    jobs.task_done()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write queued messages grouped per wallet, then run summary jobs"""
+        from db.chat_history_db import db
+
+        messages: Dict[str, List[Dict]] = {}
+        summaries: Dict[str, Any] = {}
+        for job in batch:
+            if job["type"] == "message":
+                messages.setdefault(job["wallet_address"], []).append(job["message"])
+            else:
+                summaries[job["wallet_address"]] = job["client"]
+
+        if db.collection is None:
+            # No database configured - nothing to retry
+            return False
+
+        ok = True
+        for wallet_address, wallet_messages in messages.items():
+            # Retries reuse the first reservation, so a partly written batch isn't written twice
+            reserved = {}
+
+            def write():
+                if "first_seq" not in reserved:
+                    reserved["first_seq"] = db.reserve_sequence(wallet_address, len(wallet_messages))
+                return db.add_messages(wallet_address, wallet_messages, first_seq=reserved["first_seq"])
+
+            if self._with_retry(write):
+                with self._lock:
+                    self._metrics["written"] += len(wallet_messages)
+            else:
+                ok = False
+                with self._lock:
+                    self._metrics["dropped"] += len(wallet_messages)
+                print(f"❌ Dropped {len(wallet_messages)} chat messages for {wallet_address[:10]}...")
+
+        for wallet_address, client in summaries.items():
+            self._update_summary(db, wallet_address, client)
+
+        with self._lock:
+            self._metrics["batches"] += 1
+        return ok
+
+    def _with_retry(self, write) -> bool:
+        """Run a write, retrying errors with jittered exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if write():
+                    return True
+            except Exception as e:
+                print(f"⚠️ Chat write failed (attempt {attempt + 1}): {e}")
+
+            if attempt < self.max_retries:
+                with self._lock:
+                    self._metrics["retries"] += 1
+                time.sleep(self.backoff * (2 ** attempt) + random.uniform(0, self.backoff))
+        return False
+
+    def _update_summary(self, db, wallet_address: str, client):
+        from services.summarizer import ChatSummarizer
+
+        try:
+            message_count = db.get_message_count(wallet_address)
+            if message_count:
+                ChatSummarizer.update_summary_if_needed(wallet_address, message_count, db, client)
+                with self._lock:
+                    self._metrics["summary_jobs"] += 1
+        except Exception as e:
+            print(f"⚠️ Failed to update summary: {e}")
+
+
+# Global instance
+persistence_queue = PersistenceQueue(
+    maxsize=int(os.getenv("PERSISTENCE_QUEUE_SIZE", 1000)),
+    batch_size=int(os.getenv("PERSISTENCE_BATCH_SIZE", 50)),
+    put_timeout=float(os.getenv("PERSISTENCE_PUT_TIMEOUT", 5)),
+)
+atexit.register(persistence_queue.shutdown)
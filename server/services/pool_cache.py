@@ -0,0 +1,203 @@
+"""
+Yield Pool Snapshot Cache - Process-wide, TTL-bounded cache of DeFiLlama pools
+Serves the last snapshot while a background refresh runs (stale-while-revalidate),
+collapses concurrent downloads into a single in-flight request and, after a
+failed download, keeps serving the old snapshot for a short cool-down
+"""
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, List
+
+
+class PoolSnapshot:
+    """Immutable view of one DeFiLlama pool download"""
+
+    def __init__(self, pools: List[Dict[str, Any]], version: int, fetched_at: float):
+        self.pools = pools
+        self.version = version
+        self.fetched_at = fetched_at
+        self._index = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def age(self) -> float:
+        """Seconds since this snapshot was downloaded"""
+        return time.time() - self.fetched_at
+
+    @property
+    def index(self):
+        """Columnar PoolIndex over this snapshot (built once, on first use)"""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    from tools.pool_index import PoolIndex
+                    self._index = PoolIndex(self.pools)
+        return self._index
+
+
+class PoolSnapshotCache:
+    """Shared DeFiLlama pool snapshot with TTL, background refresh and single-flight"""
+
+    def __init__(self, ttl: float = 300.0, refresh_ahead: float = 60.0, error_backoff: float = 30.0):
+        """
+        Args:
+            ttl: Seconds a snapshot may be served before it is considered expired
+            refresh_ahead: Seconds before expiry at which a background refresh starts
+            error_backoff: Seconds after a failed download before another is tried
+        """
+        self.ttl = ttl
+        self.refresh_ahead = min(refresh_ahead, ttl)
+        self.error_backoff = error_backoff
+
+        self._snapshot: Optional[PoolSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._inflight: Optional[threading.Event] = None
+        self._failed_at = 0.0
+
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "refreshes": 0,
+            "background_refreshes": 0,
+            "coalesced_waits": 0,
+            "errors": 0,
+            "backoff_skips": 0,
+        }
+
+    def get_snapshot(self, api_key: Optional[str] = None) -> Optional[PoolSnapshot]:
+        """
+        Get the current pool snapshot, downloading it if missing or expired
+        Returns None only if there is no snapshot and the download failed
+        (or failed less than error_backoff seconds ago)
+        """
+        with self._lock:
+            snapshot = self._snapshot
+
+            if snapshot and snapshot.age < self.ttl:
+                self._metrics["hits"] += 1
+                # Start refreshing in the background shortly before expiry
+                if (snapshot.age >= self.ttl - self.refresh_ahead and self._inflight is None
+                        and not self._backing_off_locked()):
+                    self._start_refresh_locked(api_key, background=True)
+                return snapshot
+
+            self._metrics["misses"] += 1
+
+            # The last download just failed - don't block on another one yet
+            if self._inflight is None and self._backing_off_locked():
+                self._metrics["backoff_skips"] += 1
+                if snapshot:
+                    self._metrics["stale_hits"] += 1
+                return snapshot
+
+            # Someone else is already downloading - wait for their result
+            if self._inflight is not None:
+                self._metrics["coalesced_waits"] += 1
+                event = self._inflight
+                leader = False
+            else:
+                event = self._start_refresh_locked(api_key, background=False)
+                leader = True
+
+        if leader:
+            self._refresh(api_key, event)
+        else:
+            event.wait()
+
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            if self._snapshot is not snapshot and self._snapshot.age < self.ttl:
+                return self._snapshot
+            # Refresh failed - serve the expired snapshot rather than nothing
+            self._metrics["stale_hits"] += 1
+            return self._snapshot
+
+    def get_pools(self, api_key: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get the list of pools from the current snapshot"""
+        snapshot = self.get_snapshot(api_key)
+        return snapshot.pools if snapshot else None
+
+    def invalidate(self):
+        """Drop the current snapshot so the next request downloads a fresh one"""
+        with self._lock:
+            self._snapshot = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache metrics for monitoring"""
+        with self._lock:
+            snapshot = self._snapshot
+            return {
+                **self._metrics,
+                "ttl": self.ttl,
+                "refresh_ahead": self.refresh_ahead,
+                "version": snapshot.version if snapshot else None,
+                "pool_count": len(snapshot.pools) if snapshot else 0,
+                "age_seconds": round(snapshot.age, 1) if snapshot else None,
+                "refreshing": self._inflight is not None,
+                "backing_off": self._backing_off_locked(),
+            }
+
+    def _backing_off_locked(self) -> bool:
+        """Whether the last download failed within error_backoff (caller must hold the lock)"""
+        return time.time() - self._failed_at < self.error_backoff
+
+    def _start_refresh_locked(self, api_key: Optional[str], background: bool) -> threading.Event:
+        """Mark a refresh as in flight (caller must hold the lock)"""
+        event = threading.Event()
+        self._inflight = event
+
+        if background:
+            self._metrics["background_refreshes"] += 1
+            thread = threading.Thread(
+                target=self._refresh,
+                args=(api_key, event),
+                name="pool-cache-refresh",
+                daemon=True
+            )
+            thread.start()
+
+        return event
+
+    def _refresh(self, api_key: Optional[str], event: threading.Event):
+        """Download a new snapshot and publish it"""
+        from tools.yield_tools import DeFiLlamaYields
+
+        try:
+            pools = DeFiLlamaYields.get_all_pools(api_key=api_key)
+        except Exception as e:
+            print(f"❌ Error refreshing yield pool snapshot: {e}")
+            pools = None
+
+        snapshot = None
+        if pools:
+            snapshot = PoolSnapshot(pools, self._version + 1, time.time())
+            # Build the column index off the request path, before publishing
+            try:
+                snapshot.index
+            except Exception as e:
+                print(f"⚠️ Could not build pool index: {e}")
+
+        with self._lock:
+            if snapshot:
+                self._version = snapshot.version
+                self._snapshot = snapshot
+                self._metrics["refreshes"] += 1
+                self._failed_at = 0.0
+                print(f"♻️ Yield pool snapshot v{self._version} cached ({len(pools)} pools)")
+            else:
+                self._metrics["errors"] += 1
+                self._failed_at = time.time()
+            self._inflight = None
+            event.set()
+
+
+# Global instance
+pool_cache = PoolSnapshotCache(
+    ttl=float(os.getenv("YIELD_POOLS_TTL", 300)),
+    refresh_ahead=float(os.getenv("YIELD_POOLS_REFRESH_AHEAD", 60)),
+    error_backoff=float(os.getenv("YIELD_POOLS_ERROR_BACKOFF", 30))
+)
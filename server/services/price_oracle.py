@@ -0,0 +1,199 @@
+"""
+Price Oracle - In-process USD prices for the swap tokens
+One batched CoinGecko /simple/price request refreshes every supported token on
+a schedule; cross rates are computed from memory, so building a swap quote
+never waits on the network. Every quote carries the age of its prices and is
+flagged stale once they are older than max_age.
+"""
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+
+COINGECKO_PRICE_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+# Token symbol -> CoinGecko coin id (covers every symbol in SwapParser.TOKENS)
+COINGECKO_IDS = {
+    "SOL": "solana",
+    "USDC": "usd-coin",
+    "USDT": "tether",
+    "ETH": "ethereum",
+    "BTC": "bitcoin",
+    "BASE": "ethereum",  # BASE uses ETH
+    "FET": "fetch-ai",
+    "MATIC": "matic-network",
+    "AVAX": "avalanche-2",
+    "LINK": "chainlink",
+    "DAI": "dai",
+    "BONK": "bonk",
+    "WIF": "dogwifhat",
+    "JUP": "jupiter-exchange-solana",
+}
+
+
+class PriceOracle:
+    """Scheduled batch price fetcher serving cross-rate quotes from memory"""
+
+    def __init__(
+        self,
+        coin_ids: Dict[str, str],
+        refresh_interval: float = 30.0,
+        max_age: float = 300.0,
+        warmup_timeout: float = 5.0
+    ):
+        """
+        Args:
+            coin_ids: Token symbol -> CoinGecko coin id
+            refresh_interval: Seconds between batched price refreshes
+            max_age: Seconds after which a quote is flagged stale
+            warmup_timeout: Seconds a quote waits for the very first refresh of the process
+        """
+        self.coin_ids = {symbol.upper(): coin_id for symbol, coin_id in coin_ids.items()}
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.warmup_timeout = warmup_timeout
+
+        # coin id -> (usd price, unix time of the price)
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._worker: Optional[threading.Thread] = None
+        self._loaded = threading.Event()
+        self._stop = threading.Event()
+        self._metrics = {"refreshes": 0, "errors": 0, "quotes": 0, "stale_quotes": 0, "missing_quotes": 0}
+
+    def start(self):
+        """Start the refresh thread for this process (recreated after fork)"""
+        pid = os.getpid()
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._loaded = threading.Event()
+            if self._prices:
+                self._loaded.set()
+            self._stop = threading.Event()
+            self._worker = threading.Thread(target=self._run, name="price-oracle", daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        stop = self._stop
+        while not stop.is_set():
+            self.refresh()
+            stop.wait(self.refresh_interval)
+
+    def refresh(self) -> bool:
+        """Fetch USD prices for all tokens in one request; returns True on success"""
+        from services.http_client import http_pool
+
+        ids = sorted(set(self.coin_ids.values()))
+        try:
+            response = http_pool.get(
+                COINGECKO_PRICE_URL,
+                params={
+                    "ids": ",".join(ids),
+                    "vs_currencies": "usd",
+                    "include_last_updated_at": "true"
+                },
+                timeout=10
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            with self._lock:
+                self._metrics["errors"] += 1
+            print(f"⚠️ Price oracle refresh failed: {e}")
+            return False
+
+        now = time.time()
+        prices = {}
+        for coin_id in ids:
+            quote = data.get(coin_id) or {}
+            usd = quote.get("usd")
+            if usd and usd > 0:
+                prices[coin_id] = (float(usd), float(quote.get("last_updated_at") or now))
+
+        with self._lock:
+            self._prices.update(prices)
+            self._metrics["refreshes"] += 1
+        self._loaded.set()
+        print(f"📊 Price oracle refreshed {len(prices)}/{len(ids)} token prices")
+        return bool(prices)
+
+    def price(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """(usd price, age in seconds) for a token symbol, or None if unknown"""
+        coin_id = self.coin_ids.get(symbol.upper())
+        with self._lock:
+            entry = self._prices.get(coin_id) if coin_id else None
+        if entry is None:
+            return None
+        usd, updated_at = entry
+        return usd, max(0.0, time.time() - updated_at)
+
+    def quote(self, from_token: str, to_token: str, amount: float = 1.0) -> Optional[Dict[str, Any]]:
+        """
+        Cross-rate quote from the in-memory prices
+
+        Args:
+            from_token: Symbol to sell (e.g. "SOL")
+            to_token: Symbol to buy (e.g. "USDC")
+            amount: Amount of from_token
+
+        Returns:
+            {rate, to_amount, from_price_usd, to_price_usd, source, age_seconds, stale},
+            or None if either token has no price
+        """
+        self.start()
+        if not self._loaded.is_set():
+            # Only the first quotes of a process wait, and only for the first refresh
+            self._loaded.wait(self.warmup_timeout)
+
+        from_price = self.price(from_token)
+        to_price = self.price(to_token)
+        if from_price is None or to_price is None:
+            with self._lock:
+                self._metrics["missing_quotes"] += 1
+            return None
+
+        age = max(from_price[1], to_price[1])
+        stale = age > self.max_age
+        with self._lock:
+            self._metrics["quotes"] += 1
+            if stale:
+                self._metrics["stale_quotes"] += 1
+
+        rate = from_price[0] / to_price[0]
+        return {
+            "rate": rate,
+            "to_amount": amount * rate,
+            "from_price_usd": from_price[0],
+            "to_price_usd": to_price[0],
+            "source": "coingecko",
+            "age_seconds": round(age, 1),
+            "stale": stale,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            ages = [now - updated_at for _, updated_at in self._prices.values()]
+            return {
+                **self._metrics,
+                "tokens": len(self._prices),
+                "refresh_interval": self.refresh_interval,
+                "max_age": self.max_age,
+                "oldest_price_seconds": round(max(ages), 1) if ages else None,
+                "running": self._pid == os.getpid() and self._worker is not None and self._worker.is_alive(),
+            }
+
+
+# Global instance (the refresh thread starts with the first quote)
+price_oracle = PriceOracle(
+    COINGECKO_IDS,
+    refresh_interval=float(os.getenv("PRICE_ORACLE_INTERVAL", 30)),
+    max_age=float(os.getenv("PRICE_ORACLE_MAX_AGE", 300)),
+)
@@ -0,0 +1,187 @@
+"""
+Response Cache - Reuses LLM answers to repeated, self-contained questions
+Entries are keyed by scope plus a normalized form of the message. A local
+hashed bag-of-words vector index also matches close rephrasings
+("what's impermanent loss?" / "what is impermanent loss"); nothing leaves
+the process. Messages that refer back to the conversation are never cached.
+"""
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from services.ttl_cache import TTLCache
+
+
+# Words that make a message depend on earlier turns or on the user
+CONTEXT_WORDS = {
+    "it", "its", "that", "this", "these", "those", "they", "them", "their",
+    "he", "she", "his", "her", "above", "earlier", "previous", "before", "again",
+    "more", "else", "same", "my", "mine", "me", "i", "im", "we", "our", "us",
+}
+
+# Words ignored by the similarity vectors
+STOP_WORDS = {
+    "what", "whats", "is", "are", "was", "the", "a", "an", "of", "to", "in", "on",
+    "and", "or", "s", "do", "does", "how", "can", "could", "you", "please",
+    "explain", "tell", "about", "describe", "define", "meaning", "mean", "means",
+}
+
+MAX_MESSAGE_CHARS = 300
+
+
+class ResponseCache:
+    """TTL/LRU cache of chat answers with optional similarity lookup"""
+
+    def __init__(self, maxsize: int = 500, ttl: float = 3600.0, similarity: float = 0.92, dim: int = 1024):
+        """
+        Args:
+            maxsize: Answers kept; the least recently used is evicted
+            ttl: Seconds an answer is reused
+            similarity: Cosine similarity for a rephrased question to match (0 disables)
+            dim: Size of the hashed feature vectors
+        """
+        self.similarity = similarity
+        self.dim = dim
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        # scope -> {normalized message: vector}, mirrored from _entries
+        self._vectors: Dict[str, Dict[str, np.ndarray]] = {}
+        self._matrices: Dict[str, Tuple[list, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "bypassed": 0, "stores": 0}
+
+    @staticmethod
+    def normalize(message: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace"""
+        return " ".join(re.sub(r"[^a-z0-9]+", " ", message.lower().replace("'", "")).split())
+
+    @staticmethod
+    def is_cacheable(message: str) -> bool:
+        """Self-contained questions only (no references to the conversation, no addresses)"""
+        if not message or len(message) > MAX_MESSAGE_CHARS or "0x" in message.lower():
+            return False
+        return not (set(ResponseCache.normalize(message).split()) & CONTEXT_WORDS)
+
+    def get(self, message: str, scope: str = "chat") -> Optional[Dict[str, Any]]:
+        """
+        Cached answer for a message, or None
+
+        Args:
+            message: User message
+            scope: What produced the answer (e.g. "chat", "explain:<topic>")
+        """
+        if not self.is_cacheable(message):
+            self._count("bypassed")
+            return None
+
+        normalized = self.normalize(message)
+        value = self._entries.get((scope, normalized))
+        if value is not None:
+            self._count("exact_hits")
+            return value
+
+        if self.similarity > 0:
+            match = self._nearest(scope, normalized)
+            if match is not None:
+                value = self._entries.get((scope, match))
+                if value is not None:
+                    self._count("similar_hits")
+                    return value
+                self._forget(scope, match)
+
+        self._count("misses")
+        return None
+
+    def set(self, message: str, value: Dict[str, Any], scope: str = "chat") -> bool:
+        """Store an answer; returns False if the message isn't cacheable"""
+        if not value or not self.is_cacheable(message):
+            return False
+
+        normalized = self.normalize(message)
+        self._entries.set((scope, normalized), value)
+        if self.similarity > 0:
+            vector = self._vectorize(normalized)
+            if vector is not None:
+                with self._lock:
+                    vectors = self._vectors.setdefault(scope, {})
+                    vectors[normalized] = vector
+                    self._matrices.pop(scope, None)
+                    # Drop vectors of evicted entries once they pile up
+                    if len(vectors) > 2 * self._entries.maxsize:
+                        self._prune_locked(scope)
+        self._count("stores")
+        return True
+
+    def _nearest(self, scope: str, normalized: str) -> Optional[str]:
+        """Most similar stored message in scope, if above the threshold"""
+        vector = self._vectorize(normalized)
+        if vector is None:
+            return None
+
+        with self._lock:
+            vectors = self._vectors.get(scope)
+            if not vectors:
+                return None
+            matrix = self._matrices.get(scope)
+            if matrix is None:
+                keys = list(vectors)
+                matrix = (keys, np.vstack([vectors[key] for key in keys]))
+                self._matrices[scope] = matrix
+
+        keys, vectors_matrix = matrix
+        scores = vectors_matrix @ vector
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= self.similarity else None
+
+    def _vectorize(self, normalized: str) -> Optional[np.ndarray]:
+        """Signed feature-hashed unigrams and bigrams, L2-normalized"""
+        words = [word for word in normalized.split() if word not in STOP_WORDS]
+        if not words:
+            return None
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = zlib.crc32(feature.encode())
+            vector[digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _forget(self, scope: str, normalized: str):
+        with self._lock:
+            if self._vectors.get(scope, {}).pop(normalized, None) is not None:
+                self._matrices.pop(scope, None)
+
+    def _prune_locked(self, scope: str):
+        live = {key[1] for key in self._entries.keys() if key[0] == scope}
+        self._vectors[scope] = {k: v for k, v in self._vectors[scope].items() if k in live}
+        self._matrices.pop(scope, None)
+
+    def _count(self, metric: str):
+        with self._lock:
+            self._metrics[metric] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        lookups = metrics["exact_hits"] + metrics["similar_hits"] + metrics["misses"]
+        hits = metrics["exact_hits"] + metrics["similar_hits"]
+        return {
+            **metrics,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "ttl": self._entries.ttl,
+            "similarity": self.similarity,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+        }
+
+
+# Global instance
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", 500)),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", 3600)),
+    similarity=float(os.getenv("RESPONSE_CACHE_SIMILARITY", 0.92)),
+)
@@ -46,7 +46,11 @@ Conversation context:
 Summary (be concise, avoid "conversation about"):"""
 
         try:
-            response = asi_client.chat.completions.create(
+            from services.llm_client import llm_registry
+
+            response = llm_registry.chat_completion(
+                "chat.summary",
+                asi_client,
                 model="asi1-mini",
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that creates very brief, concise summaries of conversations. Return only the summary, no explanations."},
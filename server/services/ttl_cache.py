@@ -0,0 +1,83 @@
+"""
+TTL Cache - Small thread-safe LRU cache with per-entry expiry
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Hashable
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: Maximum number of entries; the least recently used is evicted
+            ttl: Seconds an entry stays valid after it was last written
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry (and mark it recently used)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._metrics["expirations"] += 1
+                self._metrics["misses"] += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._metrics["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an entry, evicting the least recently used one if full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry and return its value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def keys(self) -> list:
+        """Snapshot of the stored keys (expired entries included until touched)"""
+        with self._lock:
+            return list(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache metrics for monitoring"""
+        with self._lock:
+            lookups = self._metrics["hits"] + self._metrics["misses"]
+            return {
+                **self._metrics,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hit_rate": round(self._metrics["hits"] / lookups, 3) if lookups else None,
+            }
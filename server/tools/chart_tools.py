@@ -4,7 +4,8 @@ Chart Analysis Tools - Using Chart-IMG API for TradingView chart analysis with G
 import requests
 import os
 from typing import Dict, Any, Optional
-import google.generativeai as genai
+from services.http_client import http_pool
+from services.lazy_import import lazy_import
 import base64
 import tempfile
 import hashlib
@@ -20,6 +21,10 @@ DEMO_CHARTS = {
 # Flag to enable demo mode (use local images)
 DEMO_MODE = os.getenv("CHART_DEMO_MODE", "false").lower() == "true"
 
+# Vision stack, imported on the first chart analysis
+genai = lazy_import("google.generativeai")
+PIL_Image = lazy_import("PIL.Image")
+
 
 class ChartAnalyzer:
     """Chart analysis using Chart-IMG API and Gemini AI"""
@@ -107,7 +112,7 @@ class ChartAnalyzer:
             print(f"📦 Payload: {payload}")
             print(f"🔑 Headers: {list(headers.keys())}")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = http_pool.post(url, json=payload, headers=headers, timeout=30)
             
             print(f"📋 Response status: {response.status_code}")
             print(f"📋 Response headers: {dict(response.headers)}")
@@ -189,8 +194,7 @@ Analyze the following:
 Be confident and specific in your analysis. Use technical trading terms and provide actionable insights."""
 
             # Load the image
-            import PIL.Image
-            image = PIL.Image.open(chart_image_path)
+            image = PIL_Image.open(chart_image_path)
             
             # Use Gemini 2.0 Flash
             model = genai.GenerativeModel('gemini-2.0-flash-exp')
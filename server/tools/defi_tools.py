@@ -3,112 +3,141 @@ DeFi tools for cryptocurrency and market analysis
 """
 import requests
 from typing import Dict, Any, Optional, List
+from services.http_client import http_pool
+from services.market_cache import market_cache, PRICE_TTL, TRENDING_TTL, CHART_TTL
 from datetime import datetime
 
 
 class CoinGeckoAPI:
-    """CoinGecko API client for cryptocurrency data"""
+    """CoinGecko API client for cryptocurrency data (responses cached in market_cache)"""
 
     BASE_URL = "https://api.coingecko.com/api/v3"
 
     @staticmethod
     def get_coin_data(coin_id: str) -> Optional[Dict[str, Any]]:
         """Get coin data from CoinGecko"""
-        try:
-            url = f"{CoinGeckoAPI.BASE_URL}/coins/{coin_id}"
-            params = {
-                "localization": "false",
-                "tickers": "false",
-                "community_data": "false",
-                "developer_data": "false"
-            }
-
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+        return market_cache.fetch(
+            ("coin", coin_id),
+            lambda: CoinGeckoAPI._fetch_coin_data(coin_id),
+            ttl=PRICE_TTL
+        )
 
-            return {
-                "coin_id": coin_id,
-                "name": data.get("name", ""),
-                "symbol": data.get("symbol", "").upper(),
-                "current_price": data.get("market_data", {}).get("current_price", {}).get("usd", 0),
-                "market_cap": data.get("market_data", {}).get("market_cap", {}).get("usd", 0),
-                "total_volume": data.get("market_data", {}).get("total_volume", {}).get("usd", 0),
-                "price_change_24h": data.get("market_data", {}).get("price_change_24h", 0),
-                "price_change_percentage_24h": data.get("market_data", {}).get("price_change_percentage_24h", 0),
-                "market_cap_rank": data.get("market_cap_rank"),
-                "last_updated": data.get("last_updated", "")
-            }
-
-        except requests.RequestException as e:
-            print(f"Error fetching coin data: {e}")
-            return None
+    @staticmethod
+    def _fetch_coin_data(coin_id: str) -> Dict[str, Any]:
+        url = f"{CoinGeckoAPI.BASE_URL}/coins/{coin_id}"
+        params = {
+            "localization": "false",
+            "tickers": "false",
+            "community_data": "false",
+            "developer_data": "false"
+        }
+
+        response = http_pool.get(url, params=params, timeout=10)
+        response.raise_for_status()
+
+        data = response.json()
+
+        return {
+            "coin_id": coin_id,
+            "name": data.get("name", ""),
+            "symbol": data.get("symbol", "").upper(),
+            "current_price": data.get("market_data", {}).get("current_price", {}).get("usd", 0),
+            "market_cap": data.get("market_data", {}).get("market_cap", {}).get("usd", 0),
+            "total_volume": data.get("market_data", {}).get("total_volume", {}).get("usd", 0),
+            "price_change_24h": data.get("market_data", {}).get("price_change_24h", 0),
+            "price_change_percentage_24h": data.get("market_data", {}).get("price_change_percentage_24h", 0),
+            "market_cap_rank": data.get("market_cap_rank"),
+            "last_updated": data.get("last_updated", "")
+        }
 
     @staticmethod
     def get_trending_coins() -> List[Dict[str, Any]]:
         """Get trending coins"""
-        try:
-            url = f"{CoinGeckoAPI.BASE_URL}/search/trending"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+        return market_cache.fetch(
+            ("trending",),
+            CoinGeckoAPI._fetch_trending_coins,
+            ttl=TRENDING_TTL,
+            default=[]
+        )
 
-            data = response.json()
-            return data.get("coins", [])
+    @staticmethod
+    def _fetch_trending_coins() -> List[Dict[str, Any]]:
+        url = f"{CoinGeckoAPI.BASE_URL}/search/trending"
+        response = http_pool.get(url, timeout=10)
+        response.raise_for_status()
 
-        except requests.RequestException as e:
-            print(f"Error fetching trending coins: {e}")
-            return []
+        data = response.json()
+        return data.get("coins", [])
 
     @staticmethod
     def get_market_chart(coin_id: str, days: int = 7) -> Optional[Dict[str, Any]]:
         """Get market chart data"""
-        try:
-            url = f"{CoinGeckoAPI.BASE_URL}/coins/{coin_id}/market_chart"
-            params = {
-                "vs_currency": "usd",
-                "days": days
-            }
+        return market_cache.fetch(
+            ("market_chart", coin_id, days),
+            lambda: CoinGeckoAPI._fetch_market_chart(coin_id, days),
+            ttl=CHART_TTL
+        )
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+    @staticmethod
+    def _fetch_market_chart(coin_id: str, days: int) -> Dict[str, Any]:
+        url = f"{CoinGeckoAPI.BASE_URL}/coins/{coin_id}/market_chart"
+        params = {
+            "vs_currency": "usd",
+            "days": days
+        }
 
-            return response.json()
+        response = http_pool.get(url, params=params, timeout=10)
+        response.raise_for_status()
 
-        except requests.RequestException as e:
-            print(f"Error fetching market chart: {e}")
-            return None
+        return response.json()
 
 
 class FearGreedIndexAPI:
-    """Fear and Greed Index API client"""
+    """Fear and Greed Index API client (cached until the index updates)"""
 
     BASE_URL = "https://api.alternative.me/fng/"
 
+    # Freshness when the API doesn't say when it updates next (seconds)
+    DEFAULT_TTL = 300.0
+
     @staticmethod
     def get_fgi_data(limit: int = 1) -> Optional[Dict[str, Any]]:
         """Get Fear and Greed Index data"""
-        try:
-            params = {"limit": limit}
-            response = requests.get(FearGreedIndexAPI.BASE_URL, params=params, timeout=10)
-            response.raise_for_status()
+        return market_cache.fetch(
+            ("fgi", limit),
+            lambda: FearGreedIndexAPI._fetch_fgi_data(limit),
+            ttl=FearGreedIndexAPI._ttl
+        )
 
-            data = response.json()
+    @staticmethod
+    def _fetch_fgi_data(limit: int) -> Optional[Dict[str, Any]]:
+        params = {"limit": limit}
+        response = http_pool.get(FearGreedIndexAPI.BASE_URL, params=params, timeout=10)
+        response.raise_for_status()
 
-            if data.get("data") and len(data["data"]) > 0:
-                latest = data["data"][0]
-                return {
-                    "value": latest.get("value", ""),
-                    "value_classification": latest.get("value_classification", ""),
-                    "timestamp": latest.get("timestamp", ""),
-                    "time_until_update": latest.get("time_until_update")
-                }
+        data = response.json()
 
-            return None
+        if data.get("data") and len(data["data"]) > 0:
+            latest = data["data"][0]
+            return {
+                "value": latest.get("value", ""),
+                "value_classification": latest.get("value_classification", ""),
+                "timestamp": latest.get("timestamp", ""),
+                "time_until_update": latest.get("time_until_update")
+            }
 
-        except requests.RequestException as e:
-            print(f"Error fetching FGI data: {e}")
-            return None
+        return None
+
+    @staticmethod
+    def _ttl(fgi_data: Dict[str, Any]) -> float:
+        """Cache the index until its next update (between 1 minute and 1 day)"""
+        try:
+            seconds = float(fgi_data.get("time_until_update") or 0)
+        except (TypeError, ValueError):
+            seconds = 0
+        if seconds <= 0:
+            return FearGreedIndexAPI.DEFAULT_TTL
+        return min(max(seconds, 60.0), 86400.0)
 
 
 class DeFiLlamaAPI:
@@ -121,7 +150,7 @@ class DeFiLlamaAPI:
         """Get TVL for a specific protocol"""
         try:
             url = f"{DeFiLlamaAPI.BASE_URL}/protocol/{protocol}"
-            response = requests.get(url, timeout=10)
+            response = http_pool.get(url, timeout=10)
             response.raise_for_status()
 
             return response.json()
@@ -135,7 +164,7 @@ class DeFiLlamaAPI:
         """Get all DeFi protocols"""
         try:
             url = f"{DeFiLlamaAPI.BASE_URL}/protocols"
-            response = requests.get(url, timeout=10)
+            response = http_pool.get(url, timeout=10)
             response.raise_for_status()
 
             return response.json()
@@ -149,7 +178,7 @@ class DeFiLlamaAPI:
         """Get TVL for a specific chain"""
         try:
             url = f"{DeFiLlamaAPI.BASE_URL}/chains"
-            response = requests.get(url, timeout=10)
+            response = http_pool.get(url, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -177,13 +206,10 @@ class ASI1API:
     ) -> Optional[str]:
         """Analyze DeFi data using ASI1 Mini via OpenAI library"""
         try:
-            from openai import OpenAI
+            from services.llm_client import llm_registry
 
-            # Create OpenAI client pointing to ASI1 endpoint
-            client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.asi1.ai/v1"
-            )
+            # Shared ASI1 client
+            client = llm_registry.get_client(api_key)
 
             # Construct prompt
             prompt_parts = [f"Analyze this cryptocurrency data and provide insights:\n\nCoin: {coin_data.get('name')} ({coin_data.get('symbol')})"]
@@ -205,7 +231,9 @@ class ASI1API:
             print("Calling ASI1 Mini API...")
 
             # Call ASI1 Mini using OpenAI client
-            completion = client.chat.completions.create(
+            completion = llm_registry.chat_completion(
+                "defi_analysis",
+                client,
                 messages=[
                     {"role": "system", "content": "You are Superio, an advanced onchain intelligence AI assistant. You specialize in DeFi analysis, cryptocurrency markets, and blockchain data. Provide clear, data-driven insights and recommendations in 2-3 sentences. Never introduce yourself as ASI:One or any other identity - you are Superio."},
                     {"role": "user", "content": prompt}
@@ -0,0 +1,182 @@
+"""
+Pool Index - Columnar, indexed view over a DeFiLlama pool snapshot
+Built once per snapshot so yield queries are answered with vectorized
+NumPy masks instead of Python passes over every pool dict
+"""
+import re
+from typing import Dict, Any, Optional, List
+
+import numpy as np
+
+
+# Keywords used to classify stablecoin pools (matches DeFiLlamaYields.get_stable_pools)
+STABLE_KEYWORDS = ['usdc', 'usdt', 'dai', 'busd', 'frax', 'lusd', 'susd']
+
+# Separators used in pool symbols (e.g. 'USDC-WETH', 'STETH/ETH')
+SYMBOL_SEPARATORS = re.compile(r'[-_/ ]+')
+
+
+def _number(value: Any) -> float:
+    """Coerce a possibly-missing numeric field to float (None -> 0)"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PoolIndex:
+    """Column store with hash and inverted indexes over a list of pools"""
+
+    def __init__(self, pools: List[Dict[str, Any]]):
+        self.pools = pools
+        size = len(pools)
+
+        # Numeric columns
+        self.tvl = np.fromiter((_number(p.get('tvlUsd')) for p in pools), dtype=np.float64, count=size)
+        self.apy = np.fromiter((_number(p.get('apy')) for p in pools), dtype=np.float64, count=size)
+        self.apy_reward = np.fromiter((_number(p.get('apyReward')) for p in pools), dtype=np.float64, count=size)
+        self.apy_total = self.apy + self.apy_reward
+
+        # Hash indexes: lowercase chain/project -> row ids
+        self._chain_rows: Dict[str, np.ndarray] = {}
+        self._project_rows: Dict[str, np.ndarray] = {}
+
+        # Inverted index: token symbol -> row ids, plus full uppercase symbols
+        self._token_rows: Dict[str, np.ndarray] = {}
+        self._symbols: List[str] = []
+
+        chain_lists: Dict[str, List[int]] = {}
+        project_lists: Dict[str, List[int]] = {}
+        token_lists: Dict[str, List[int]] = {}
+        stable = np.zeros(size, dtype=bool)
+
+        for row, pool in enumerate(pools):
+            chain_lists.setdefault((pool.get('chain') or '').lower(), []).append(row)
+            project_lists.setdefault((pool.get('project') or '').lower(), []).append(row)
+
+            symbol = (pool.get('symbol') or '').upper()
+            self._symbols.append(symbol)
+            for token in set(SYMBOL_SEPARATORS.split(symbol)):
+                if token:
+                    token_lists.setdefault(token, []).append(row)
+
+            symbol_lower = symbol.lower()
+            stable[row] = any(keyword in symbol_lower for keyword in STABLE_KEYWORDS)
+
+        self.stable = stable
+        self._chain_rows = {k: np.asarray(v, dtype=np.int64) for k, v in chain_lists.items()}
+        self._project_rows = {k: np.asarray(v, dtype=np.int64) for k, v in project_lists.items()}
+        self._token_rows = {k: np.asarray(v, dtype=np.int64) for k, v in token_lists.items()}
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def chains(self) -> List[str]:
+        """All chains present in the snapshot (lowercase)"""
+        return sorted(self._chain_rows)
+
+    def mask(
+        self,
+        chain: Optional[str] = None,
+        project: Optional[str] = None,
+        token: Optional[str] = None,
+        min_tvl: Optional[float] = None,
+        max_tvl: Optional[float] = None,
+        min_apy: Optional[float] = None,
+        max_apy: Optional[float] = None,
+        stable_only: bool = False
+    ) -> np.ndarray:
+        """
+        Boolean row mask for a composite query (all conditions are ANDed)
+        Semantics match the DeFiLlamaYields list filters:
+            chain:   exact, case-insensitive match
+            project: case-insensitive substring of the project name
+            token:   case-insensitive substring of the pool symbol
+            min/max_apy: bounds on total APY (base + reward), inclusive
+        """
+        mask = np.ones(len(self.pools), dtype=bool)
+
+        if chain:
+            mask &= self._rows_to_mask(self._chain_rows.get(chain.lower()))
+
+        if project:
+            needle = project.lower()
+            rows = [r for key, r in self._project_rows.items() if needle in key]
+            mask &= self._rows_to_mask(np.concatenate(rows) if rows else None)
+
+        if token:
+            mask &= self._token_mask(token.upper())
+
+        if min_tvl is not None:
+            mask &= self.tvl >= min_tvl
+        if max_tvl is not None:
+            mask &= self.tvl <= max_tvl
+        if min_apy is not None:
+            mask &= self.apy_total >= min_apy
+        if max_apy is not None:
+            mask &= self.apy_total <= max_apy
+        if stable_only:
+            mask &= self.stable
+
+        return mask
+
+    def search(
+        self,
+        sort_by: Optional[str] = None,
+        descending: bool = True,
+        limit: Optional[int] = None,
+        **filters
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a composite query and return matching pool dicts
+        Args:
+            sort_by: 'tvl', 'apy' (base), 'apy_total' or None to keep snapshot order
+            descending: Sort direction
+            limit: Maximum number of pools to return (top-k)
+            **filters: Keyword arguments accepted by mask()
+        """
+        rows = np.flatnonzero(self.mask(**filters))
+
+        if sort_by:
+            column = {
+                'tvl': self.tvl,
+                'apy': self.apy,
+                'apy_total': self.apy_total,
+            }[sort_by][rows]
+            # Stable sort keeps snapshot order for ties, like sorted()
+            order = np.argsort(-column if descending else column, kind='stable')
+            rows = rows[order]
+
+        if limit is not None:
+            rows = rows[:limit]
+
+        return [self.pools[i] for i in rows]
+
+    def safe_pools(self, min_tvl: float = 20000000, min_apy: float = 7.0, max_apy: float = 15.0, **filters) -> List[Dict[str, Any]]:
+        """Indexed equivalent of DeFiLlamaYields.get_safe_pools"""
+        return self.search(sort_by='tvl', min_tvl=min_tvl, min_apy=min_apy, max_apy=max_apy, **filters)
+
+    def stable_pools(self, min_tvl: float = 500000, **filters) -> List[Dict[str, Any]]:
+        """Indexed equivalent of DeFiLlamaYields.get_stable_pools"""
+        return self.search(sort_by='apy', min_tvl=min_tvl, stable_only=True, **filters)
+
+    def top_pools_by_apy(self, limit: int = 10, min_tvl: float = 100000, **filters) -> List[Dict[str, Any]]:
+        """Indexed equivalent of DeFiLlamaYields.get_top_pools_by_apy"""
+        return self.search(sort_by='apy_total', limit=limit, min_tvl=min_tvl, **filters)
+
+    def _rows_to_mask(self, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Convert a row id array into a boolean mask"""
+        mask = np.zeros(len(self.pools), dtype=bool)
+        if rows is not None and len(rows):
+            mask[rows] = True
+        return mask
+
+    def _token_mask(self, needle: str) -> np.ndarray:
+        """Rows whose symbol contains needle (uppercase)"""
+        if SYMBOL_SEPARATORS.search(needle):
+            # Needle spans several tokens - fall back to a scan of full symbols
+            return np.fromiter((needle in s for s in self._symbols), dtype=bool, count=len(self._symbols))
+
+        # Substring match over the token vocabulary, then union the postings
+        rows = [r for token, r in self._token_rows.items() if needle in token]
+        return self._rows_to_mask(np.concatenate(rows) if rows else None)
@@ -2,7 +2,8 @@
 DeFi Yield Tools - Fetch live yield pool data from DeFiLlama
 """
 import requests
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
+from services.http_client import http_pool
 
 
 class DeFiLlamaYields:
@@ -28,7 +29,7 @@ class DeFiLlamaYields:
                 url = f"{DeFiLlamaYields.PUBLIC_BASE_URL}/pools"
 
             print(f"📊 Fetching all yield pools from DeFiLlama...")
-            response = requests.get(url, timeout=15)
+            response = http_pool.get(url, timeout=15)
             response.raise_for_status()
 
             data = response.json()
@@ -163,6 +164,24 @@ class DeFiLlamaYields:
 class YieldAnalyzer:
     """Analyze yield opportunities using AI"""
     
+    @staticmethod
+    def to_kb_pool(pool: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a DeFiLlama pool to DeFiKnowledgeBase.add_pool format"""
+        apy_base = pool.get('apy', 0) or 0
+        apy_reward = pool.get('apyReward', 0) or 0
+        apy_total = apy_base + apy_reward
+
+        return {
+            'project': pool.get('project', 'Unknown'),
+            'symbol': pool.get('symbol', 'Unknown'),
+            'chain': pool.get('chain', 'Unknown'),
+            'apy_total': round(apy_total, 2),
+            'apy_base': round(apy_base, 2),
+            'apy_reward': round(apy_reward, 2),
+            'tvl': round(pool.get('tvlUsd', 0) or 0, 0),
+            'pool_id': pool.get('pool', ''),
+        }
+
     @staticmethod
     def create_metta_knowledge_base(pools: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Create MeTTa knowledge graph from pools"""
@@ -174,34 +193,23 @@ class YieldAnalyzer:
             
             # Add all pools to knowledge base
             for pool in pools:
-                apy_base = pool.get('apy', 0) or 0
-                apy_reward = pool.get('apyReward', 0) or 0
-                apy_total = apy_base + apy_reward
-                
-                pool_data = {
-                    'project': pool.get('project', 'Unknown'),
-                    'symbol': pool.get('symbol', 'Unknown'),
-                    'chain': pool.get('chain', 'Unknown'),
-                    'apy_total': round(apy_total, 2),
-                    'apy_base': round(apy_base, 2),
-                    'apy_reward': round(apy_reward, 2),
-                    'tvl': round(pool.get('tvlUsd', 0) or 0, 0),
-                    'pool_id': pool.get('pool', ''),
-                }
-                
-                kb.add_pool(pool_data)
+                kb.add_pool(YieldAnalyzer.to_kb_pool(pool))
             
             # Generate graph data for visualization
             graph_data = kb.get_graph_data()
             
             print(f"✅ Created MeTTa knowledge base: {len(graph_data.get('nodes', []))} nodes, {len(graph_data.get('edges', []))} edges")
+
+            rule_results = kb.evaluate_rules()
             
             return {
                 'metta_facts': kb.facts,
                 'metta_rules': kb.rules,
                 'metta_string': kb.to_metta_string(),
                 'graph_data': graph_data,
-                'safe_pools': kb.query_safe_pools(),
+                'safe_pools': rule_results.get('isSafePool', []),
+                'high_risk_pools': rule_results.get('isHighRiskPool', []),
+                'stable_coin_pools': rule_results.get('hasStableCoins', []),
             }
         except Exception as e:
             print(f"❌ Error creating MeTTa knowledge base: {e}")
@@ -213,16 +221,17 @@ class YieldAnalyzer:
     def analyze_pools_with_ai(
         api_key: str,
         pools: List[Dict[str, Any]],
-        user_query: str
+        user_query: str,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
-        """Use ASI1 Mini to analyze yield pools based on user query"""
+        """
+        Use ASI1 Mini to analyze yield pools based on user query
+        If on_token is given the completion is streamed and each text chunk is passed to it
+        """
         try:
-            from openai import OpenAI
+            from services.llm_client import llm_registry
 
-            client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.asi1.ai/v1"
-            )
+            client = llm_registry.get_client(api_key)
 
             # Prepare pool data summary
             pool_summaries = []
@@ -249,17 +258,29 @@ Provide a concise analysis (2-3 sentences) highlighting:
 
 Be helpful and data-driven."""
 
-            response = client.chat.completions.create(
+            response = llm_registry.chat_completion(
+                "yield_analysis",
+                client,
                 messages=[
                     {"role": "system", "content": "You are Superio, a DeFi yield analysis expert. Provide clear, actionable insights about yield farming opportunities."},
                     {"role": "user", "content": prompt}
                 ],
                 model="asi1-mini",
                 max_tokens=400,
-                temperature=0.7
+                temperature=0.7,
+                stream=on_token is not None
             )
 
-            return response.choices[0].message.content
+            if on_token is None:
+                return response.choices[0].message.content
+
+            parts = []
+            for chunk in response:
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    on_token(text)
+            return "".join(parts)
 
         except Exception as e:
             print(f"❌ Error in AI analysis: {e}")